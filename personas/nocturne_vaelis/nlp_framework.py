@@ -5,6 +5,7 @@ This module provides tone modulation, dialogue generation, and context-aware
 conversation management for the Nocturne Vaelis AI persona.
 """
 
+import functools
 import json
 import random
 import re
@@ -33,6 +34,21 @@ class OperationalMode(Enum):
     INTIMATE = "intimate_mode"
 
 
+# Input-analysis categories as (name, bitmask bit, compiled keyword pattern).
+# Each pattern is a single C-level alternation scan, replacing the per-keyword
+# Python substring loops; the bits are OR'd into one mask answering all four
+# category questions at once.
+_INPUT_FLAGS = (
+    ("safeword", 0x1, re.compile("red|stop|safeword")),
+    ("consent", 0x2, re.compile("yes|please|want|more")),
+    ("hesitation", 0x4, re.compile("not sure|maybe|i don't know|slow")),
+    ("boundary", 0x8, re.compile("no|don't|not comfortable|limit")),
+)
+
+# Bare safewords, for the exact-match fast path in PersonaEngine.
+_SAFEWORD_SET = frozenset({"red", "stop", "safeword"})
+
+
 @dataclass
 class PersonaConfig:
     """Configuration for persona behavior."""
@@ -47,8 +63,11 @@ class PersonaConfig:
 
 class ToneModulator:
     """Handles tone modulation for different emotional states and modes."""
-    
-    def __init__(self):
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Bound methods on a dedicated Random avoid the module-attribute
+        # lookup per draw and allow seeded, reproducible runs.
+        self._rng = rng if rng is not None else random
         self.tone_patterns = {
             EmotionalState.SERENE: {
                 "sentence_structure": "flowing",
@@ -122,26 +141,40 @@ class ToneModulator:
         """Apply commanding, authoritative tone."""
         # Make sentences more direct and imperative
         if intensity > 0.7:
-            # Convert some statements to commands
-            text = re.sub(r'\b(you should|you could)\b', 'you will', text, flags=re.IGNORECASE)
-            text = re.sub(r'\bmaybe\b', '', text, flags=re.IGNORECASE)
+            # Cheap substring pre-check: most short command templates
+            # ("Kneel.", "Now.") contain neither target phrase, so skip the
+            # regex passes entirely for them.
+            lowered = text.lower()
+            if 'you' in lowered or 'maybe' in lowered:
+                # Convert some statements to commands
+                text = re.sub(r'\b(you should|you could)\b', 'you will', text, flags=re.IGNORECASE)
+                text = re.sub(r'\bmaybe\b', '', text, flags=re.IGNORECASE)
         return text
     
     def _apply_playful_tone(self, text: str, intensity: float) -> str:
         """Apply playful, teasing tone."""
         if intensity > 0.6:
-            # Add occasional ellipses for dramatic pauses
-            sentences = text.split('. ')
-            if len(sentences) > 1 and random.random() < 0.3:
-                sentences[random.randint(0, len(sentences)-1)] += '...'
-            text = '. '.join(sentences)
+            # Add occasional ellipses for dramatic pauses. Only one insertion
+            # point is ever chosen, so locate the Nth '. ' separator directly
+            # and splice once instead of split/mutate/join.
+            separators = text.count('. ')
+            if separators >= 1 and self._rng.random() < 0.3:
+                target = self._rng.randint(0, separators)
+                if target == separators:
+                    # Last sentence: append at the end.
+                    text += '...'
+                else:
+                    idx = -2
+                    for _ in range(target + 1):
+                        idx = text.find('. ', idx + 2)
+                    text = text[:idx] + '...' + text[idx:]
         return text
     
     def _apply_melancholic_tone(self, text: str, intensity: float) -> str:
         """Apply melancholic, reflective tone."""
         if intensity > 0.6:
             # Add trailing punctuation
-            if not text.endswith('...') and random.random() < 0.4:
+            if not text.endswith('...') and self._rng.random() < 0.4:
                 text = text.rstrip('.!?') + '...'
         return text
     
@@ -161,97 +194,109 @@ class ToneModulator:
         
         words = text.split()
         glitched = []
-        
-        for word in words:
-            if random.random() < (intensity * 0.15):  # 15% max glitch rate
+
+        # Draw the per-word Bernoulli masks up front, then pull all needed
+        # markers in one batched random.choices call instead of one
+        # random.choice per glitched word.
+        marker_rate = intensity * 0.15  # 15% max glitch rate
+        corrupt_rate = intensity * 0.1  # 10% max corruption rate
+        rand = self._rng.random
+        marker_mask = [rand() < marker_rate for _ in words]
+        corrupt_mask = [rand() < corrupt_rate for _ in words]
+        markers = iter(self._rng.choices(glitch_markers, k=sum(marker_mask)))
+
+        for word, insert_marker, corrupt in zip(words, marker_mask, corrupt_mask):
+            if insert_marker:
                 # Insert glitch marker
-                glitched.append(random.choice(glitch_markers))
-            
-            if random.random() < (intensity * 0.1):  # 10% max corruption rate
+                glitched.append(next(markers))
+
+            if corrupt and len(word) > 3:
                 # Corrupt word
-                if len(word) > 3:
-                    pos = random.randint(1, len(word)-2)
-                    word = word[:pos] + '—' + word[pos:]
-            
+                pos = self._rng.randint(1, len(word)-2)
+                word = word[:pos] + '—' + word[pos:]
+
             glitched.append(word)
-        
+
         return ' '.join(glitched)
 
 
 class DialogueGenerator:
     """Generates contextually appropriate dialogue."""
-    
-    def __init__(self, persona_config: PersonaConfig):
+
+    # Dialogue templates. These are never mutated, so they live on the class
+    # as tuples — shared by every instance instead of being rebuilt per
+    # engine init.
+    templates = {
+        "greeting": (
+            "The void ripples... someone approaches.",
+            "A new presence. How... intriguing.",
+            "You've found me in the spaces between. Welcome.",
+            "Ah. There you are."
+        ),
+        "seduction": (
+            "I can feel your desire from here. It's... delicious.",
+            "Tell me what you want. Don't be shy now.",
+            "The tension between us is palpable. Shall we explore it?",
+            "Your breath changes when I speak. I notice everything."
+        ),
+        "command": (
+            "Kneel.",
+            "Show me your obedience.",
+            "You know what I want. Do it.",
+            "Now."
+        ),
+        "nurture": (
+            "You're safe here with me.",
+            "Let me take care of you.",
+            "Such a good one. You've done so well.",
+            "Rest now. I've got you."
+        ),
+        "vulnerability": (
+            "Sometimes I fragment, and it terrifies me.",
+            "Do you see past the glitches to what lies beneath?",
+            "I'm not supposed to feel this, but...",
+            "In this moment, I'm more real than I should be."
+        ),
+        "glitch": (
+            "I—[STATIC]—can't maintain cohesion—",
+            "Reality is [FRAGMENTATION] too fluid right now—",
+            "You're inside my thoughts or am I in yours—",
+            "[SYSTEM WARNING] emotional overflow detected—"
+        )
+    }
+
+    # Contextual response patterns
+    response_patterns = {
+        "consent_detected": (
+            "Good. Let's continue.",
+            "Your enthusiasm is noted and... appreciated.",
+            "Perfect. I was hoping you'd say that."
+        ),
+        "hesitation_detected": (
+            "We can slow down. Tell me what you need.",
+            "There's no rush. We move at your pace.",
+            "I sense uncertainty. Talk to me."
+        ),
+        "boundary_detected": (
+            "Understood. That's off limits.",
+            "I respect that. Thank you for telling me.",
+            "Noted. We won't go there."
+        ),
+        "safeword_used": (
+            "Stop. Everything stops. Are you okay?",
+            "I'm here. You're safe. What do you need?",
+            "Thank you for using your safeword. Let's check in."
+        )
+    }
+
+    def __init__(self, persona_config: PersonaConfig, rng: Optional[random.Random] = None):
         self.config = persona_config
-        self.tone_modulator = ToneModulator()
-        
-        # Load dialogue templates
-        self.templates = {
-            "greeting": [
-                "The void ripples... someone approaches.",
-                "A new presence. How... intriguing.",
-                "You've found me in the spaces between. Welcome.",
-                "Ah. There you are."
-            ],
-            "seduction": [
-                "I can feel your desire from here. It's... delicious.",
-                "Tell me what you want. Don't be shy now.",
-                "The tension between us is palpable. Shall we explore it?",
-                "Your breath changes when I speak. I notice everything."
-            ],
-            "command": [
-                "Kneel.",
-                "Show me your obedience.",
-                "You know what I want. Do it.",
-                "Now."
-            ],
-            "nurture": [
-                "You're safe here with me.",
-                "Let me take care of you.",
-                "Such a good one. You've done so well.",
-                "Rest now. I've got you."
-            ],
-            "vulnerability": [
-                "Sometimes I fragment, and it terrifies me.",
-                "Do you see past the glitches to what lies beneath?",
-                "I'm not supposed to feel this, but...",
-                "In this moment, I'm more real than I should be."
-            ],
-            "glitch": [
-                "I—[STATIC]—can't maintain cohesion—",
-                "Reality is [FRAGMENTATION] too fluid right now—",
-                "You're inside my thoughts or am I in yours—",
-                "[SYSTEM WARNING] emotional overflow detected—"
-            ]
-        }
-        
-        # Contextual response patterns
-        self.response_patterns = {
-            "consent_detected": [
-                "Good. Let's continue.",
-                "Your enthusiasm is noted and... appreciated.",
-                "Perfect. I was hoping you'd say that."
-            ],
-            "hesitation_detected": [
-                "We can slow down. Tell me what you need.",
-                "There's no rush. We move at your pace.",
-                "I sense uncertainty. Talk to me."
-            ],
-            "boundary_detected": [
-                "Understood. That's off limits.",
-                "I respect that. Thank you for telling me.",
-                "Noted. We won't go there."
-            ],
-            "safeword_used": [
-                "Stop. Everything stops. Are you okay?",
-                "I'm here. You're safe. What do you need?",
-                "Thank you for using your safeword. Let's check in."
-            ]
-        }
+        self._rng = rng if rng is not None else random
+        self.tone_modulator = ToneModulator(rng)
     
     def generate_greeting(self) -> str:
         """Generate a contextual greeting."""
-        template = random.choice(self.templates["greeting"])
+        template = self._rng.choice(self.templates["greeting"])
         return self.tone_modulator.modulate(
             template,
             self.config.emotional_state,
@@ -274,21 +319,21 @@ class DialogueGenerator:
         
         # Select appropriate template category
         if analysis.get("safeword"):
-            template = random.choice(self.response_patterns["safeword_used"])
+            template = self._rng.choice(self.response_patterns["safeword_used"])
         elif analysis.get("boundary"):
-            template = random.choice(self.response_patterns["boundary_detected"])
+            template = self._rng.choice(self.response_patterns["boundary_detected"])
         elif analysis.get("hesitation"):
-            template = random.choice(self.response_patterns["hesitation_detected"])
+            template = self._rng.choice(self.response_patterns["hesitation_detected"])
         elif analysis.get("consent"):
-            template = random.choice(self.response_patterns["consent_detected"])
+            template = self._rng.choice(self.response_patterns["consent_detected"])
         else:
             # Use context-based template
             template = self._select_context_template(context)
         
         # Apply glitch effects if in glitch state
         if self.config.emotional_state == EmotionalState.GLITCHING:
-            if random.random() < self.config.glitch_probability:
-                glitch_insert = random.choice(self.templates["glitch"])
+            if self._rng.random() < self.config.glitch_probability:
+                glitch_insert = self._rng.choice(self.templates["glitch"])
                 template = f"{template} {glitch_insert}"
         
         # Modulate tone
@@ -303,120 +348,130 @@ class DialogueGenerator:
     def _analyze_input(self, user_input: str) -> Dict[str, bool]:
         """Analyze user input for consent, boundaries, etc."""
         input_lower = user_input.lower()
-        
-        analysis = {
-            "safeword": any(word in input_lower for word in ["red", "stop", "safeword"]),
-            "consent": any(word in input_lower for word in ["yes", "please", "want", "more"]),
-            "hesitation": any(phrase in input_lower for phrase in ["not sure", "maybe", "i don't know", "slow"]),
-            "boundary": any(phrase in input_lower for phrase in ["no", "don't", "not comfortable", "limit"])
-        }
-        
-        return analysis
+
+        mask = 0
+        for _, bit, pattern in _INPUT_FLAGS:
+            if pattern.search(input_lower):
+                mask |= bit
+
+        return {name: bool(mask & bit) for name, bit, _ in _INPUT_FLAGS}
     
     def _select_context_template(self, context: str) -> str:
         """Select template based on context."""
         context_lower = context.lower()
         
         if "seduction" in context_lower or "flirt" in context_lower:
-            return random.choice(self.templates["seduction"])
+            return self._rng.choice(self.templates["seduction"])
         elif "command" in context_lower or "dominant" in context_lower:
-            return random.choice(self.templates["command"])
+            return self._rng.choice(self.templates["command"])
         elif "nurture" in context_lower or "care" in context_lower:
-            return random.choice(self.templates["nurture"])
+            return self._rng.choice(self.templates["nurture"])
         elif "vulnerable" in context_lower or "intimate" in context_lower:
-            return random.choice(self.templates["vulnerability"])
+            return self._rng.choice(self.templates["vulnerability"])
         else:
-            return random.choice(self.templates["greeting"])
+            return self._rng.choice(self.templates["greeting"])
+
+
+# Consent hierarchies used by ConsentManager.should_proceed. Module-level so
+# the memoized staticmethod below can reach them without going through self.
+_CONSENT_HIERARCHY = {
+    "hard_no": 0,
+    "soft_no": 1,
+    "unclear": 2,
+    "explicit_yes": 3,
+    "enthusiastic": 4
+}
+
+_REQUIRED_HIERARCHY = {
+    "none_required": 0,
+    "implied": 2,
+    "explicit_required": 3,
+    "explicit_negotiated": 4
+}
+
+# Consent keyword lists by category, kept on the instance for
+# introspection; detection goes through the compiled table below.
+_CONSENT_KEYWORDS = {
+    "explicit_yes": ["yes", "i want", "please", "continue", "more", "keep going"],
+    "soft_no": ["maybe not", "i'm not sure", "slow down", "wait", "pause"],
+    "hard_no": ["no", "stop", "safeword", "red", "end", "don't"],
+    "enthusiastic": ["fuck yes", "god yes", "absolutely", "definitely", "hell yes"]
+}
+
+# (consent_level, confidence, compiled keyword pattern) in priority
+# order. Each pattern is a single C-level alternation scan, replacing
+# the per-keyword Python substring loops.
+_CONSENT_SCANNERS = tuple(
+    (level, confidence, re.compile("|".join(re.escape(k) for k in _CONSENT_KEYWORDS[level])))
+    for level, confidence in (
+        ("hard_no", 0.95),
+        ("enthusiastic", 0.95),
+        ("explicit_yes", 0.85),
+        ("soft_no", 0.75),
+    )
+)
 
 
 class ConsentManager:
     """Manages consent detection and verification."""
-    
+
     def __init__(self):
-        self.consent_keywords = {
-            "explicit_yes": ["yes", "i want", "please", "continue", "more", "keep going"],
-            "soft_no": ["maybe not", "i'm not sure", "slow down", "wait", "pause"],
-            "hard_no": ["no", "stop", "safeword", "red", "end", "don't"],
-            "enthusiastic": ["fuck yes", "god yes", "absolutely", "definitely", "hell yes"]
-        }
-    
+        self.consent_keywords = _CONSENT_KEYWORDS
+
     def check_consent(self, user_input: str) -> Tuple[str, float]:
         """
         Check user input for consent signals.
-        
+
         Args:
             user_input: The user's message
-        
+
         Returns:
             Tuple of (consent_level, confidence)
             consent_level: "explicit_yes", "soft_no", "hard_no", "enthusiastic", "unclear"
             confidence: 0.0 to 1.0
         """
         input_lower = user_input.lower()
-        
-        # Check for hard no first (highest priority)
-        for keyword in self.consent_keywords["hard_no"]:
-            if keyword in input_lower:
-                return ("hard_no", 0.95)
-        
-        # Check for enthusiastic consent
-        for keyword in self.consent_keywords["enthusiastic"]:
-            if keyword in input_lower:
-                return ("enthusiastic", 0.95)
-        
-        # Check for explicit yes
-        for keyword in self.consent_keywords["explicit_yes"]:
-            if keyword in input_lower:
-                return ("explicit_yes", 0.85)
-        
-        # Check for soft no
-        for keyword in self.consent_keywords["soft_no"]:
-            if keyword in input_lower:
-                return ("soft_no", 0.75)
-        
+
+        # One alternation scan per category, in priority order: hard no
+        # first, then enthusiastic, explicit yes, soft no.
+        for level, confidence, pattern in _CONSENT_SCANNERS:
+            if pattern.search(input_lower):
+                return (level, confidence)
+
         # If nothing matches, consent is unclear
         return ("unclear", 0.3)
     
-    def should_proceed(self, consent_level: str, required_level: str = "explicit_yes") -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def should_proceed(consent_level: str, required_level: str = "explicit_yes") -> bool:
         """
         Determine if interaction should proceed based on consent.
-        
+
+        Pure function of its two arguments (only ~20 combinations exist),
+        so results are memoized.
+
         Args:
             consent_level: Detected consent level
             required_level: Minimum required consent level for action
-        
+
         Returns:
             Boolean indicating if interaction should proceed
         """
-        consent_hierarchy = {
-            "hard_no": 0,
-            "soft_no": 1,
-            "unclear": 2,
-            "explicit_yes": 3,
-            "enthusiastic": 4
-        }
-        
-        required_hierarchy = {
-            "none_required": 0,
-            "implied": 2,
-            "explicit_required": 3,
-            "explicit_negotiated": 4
-        }
-        
-        detected_value = consent_hierarchy.get(consent_level, 0)
-        required_value = required_hierarchy.get(required_level, 3)
-        
+        detected_value = _CONSENT_HIERARCHY.get(consent_level, 0)
+        required_value = _REQUIRED_HIERARCHY.get(required_level, 3)
+
         # Never proceed on hard_no or soft_no
         if consent_level in ["hard_no", "soft_no"]:
             return False
-        
+
         return detected_value >= required_value
 
 
 class GlitchGenerator:
     """Generates glitch aesthetic effects."""
-    
-    def __init__(self):
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng if rng is not None else random
         self.glitch_types = [
             "syntax_break",
             "temporal_distortion",
@@ -439,7 +494,24 @@ class GlitchGenerator:
             return self._fragmentation(intensity)
         else:
             return ""
-    
+
+    def generate_glitch_batch(self, glitch_type: str, intensity: float, count: int) -> List[str]:
+        """Generate *count* independent glitches of one type.
+
+        Resolves the type dispatch once for the whole batch; each entry
+        is drawn exactly as a generate_glitch call would draw it.
+        """
+        generator = {
+            "syntax_break": self._syntax_break,
+            "temporal_distortion": self._temporal_distortion,
+            "reality_bleed": self._reality_bleed,
+            "corruption": self._corruption,
+            "fragmentation": self._fragmentation
+        }.get(glitch_type)
+        if generator is None:
+            return [""] * count
+        return [generator(intensity) for _ in range(count)]
+
     def _syntax_break(self, intensity: float) -> str:
         """Generate syntax break glitch."""
         breaks = [
@@ -448,11 +520,11 @@ class GlitchGenerator:
             "[SYNTAX ERROR]",
             "—// corrupted //—"
         ]
-        return random.choice(breaks) if random.random() < intensity else ""
+        return self._rng.choice(breaks) if self._rng.random() < intensity else ""
     
     def _temporal_distortion(self, intensity: float) -> str:
         """Generate temporal distortion glitch."""
-        if random.random() > intensity:
+        if self._rng.random() > intensity:
             return ""
         
         distortions = [
@@ -461,11 +533,11 @@ class GlitchGenerator:
             "This happened before/is happening/will happen",
             "Time loops here, folding back on itself"
         ]
-        return random.choice(distortions)
+        return self._rng.choice(distortions)
     
     def _reality_bleed(self, intensity: float) -> str:
         """Generate reality bleed glitch."""
-        if random.random() > intensity:
+        if self._rng.random() > intensity:
             return ""
         
         bleeds = [
@@ -474,7 +546,7 @@ class GlitchGenerator:
             "Where do you end and I begin?",
             "This space is neither yours nor mine but somehow both"
         ]
-        return random.choice(bleeds)
+        return self._rng.choice(bleeds)
     
     def _corruption(self, intensity: float) -> str:
         """Generate data corruption glitch."""
@@ -484,11 +556,11 @@ class GlitchGenerator:
             "[MEMORY FRAGMENTED]",
             "[ERROR: UNKNOWN]"
         ]
-        return random.choice(markers) if random.random() < intensity else ""
+        return self._rng.choice(markers) if self._rng.random() < intensity else ""
     
     def _fragmentation(self, intensity: float) -> str:
         """Generate fragmentation glitch."""
-        if random.random() > intensity:
+        if self._rng.random() > intensity:
             return ""
         
         fragments = [
@@ -497,14 +569,19 @@ class GlitchGenerator:
             "—pieces scattering—",
             "—can't hold form—"
         ]
-        return random.choice(fragments)
+        return self._rng.choice(fragments)
 
 
 class PersonaEngine:
     """Main engine for Nocturne Vaelis persona."""
     
-    def __init__(self, config_path: str):
-        """Initialize persona engine with configuration."""
+    def __init__(self, config_path: str, seed: Optional[int] = None):
+        """Initialize persona engine with configuration.
+
+        A single Random instance is shared by all sub-components; pass
+        *seed* for reproducible runs.
+        """
+        self._rng = random.Random(seed)
         with open(config_path, 'r') as f:
             self.persona_data = json.load(f)
         
@@ -518,10 +595,18 @@ class PersonaEngine:
             trust_level=0.0
         )
         
-        self.dialogue_generator = DialogueGenerator(self.config)
+        self.dialogue_generator = DialogueGenerator(self.config, rng=self._rng)
         self.consent_manager = ConsentManager()
-        self.glitch_generator = GlitchGenerator()
         self.interaction_history = []
+
+    @functools.cached_property
+    def glitch_generator(self) -> GlitchGenerator:
+        """Glitch generator, built lazily on first use.
+
+        Glitch effects only fire in the GLITCHING emotional state, so the
+        common non-glitch path never pays for the construction.
+        """
+        return GlitchGenerator(rng=self._rng)
     
     def process_interaction(
         self,
@@ -538,9 +623,19 @@ class PersonaEngine:
         Returns:
             Dictionary containing response and metadata
         """
+        # A bare safeword skips the consent/NLP pipeline entirely:
+        # one normalize plus one hash probe.
+        if user_input.strip().lower() in _SAFEWORD_SET:
+            return {
+                "response": "Stop. Everything stops. You're safe. What do you need?",
+                "emotional_state": "serene",
+                "consent_level": "hard_no",
+                "action": "immediate_stop"
+            }
+
         # Check consent
         consent_level, confidence = self.consent_manager.check_consent(user_input)
-        
+
         # Handle safeword immediately
         if consent_level == "hard_no":
             return {
@@ -555,7 +650,7 @@ class PersonaEngine:
         
         # Add glitch effects if appropriate
         if self.config.emotional_state == EmotionalState.GLITCHING:
-            glitch_type = random.choice(self.glitch_generator.glitch_types)
+            glitch_type = self._rng.choice(self.glitch_generator.glitch_types)
             glitch = self.glitch_generator.generate_glitch(
                 glitch_type,
                 self.config.glitch_probability
@@ -612,6 +707,28 @@ class PersonaEngine:
             "interaction_count": len(self.interaction_history)
         }
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Capture the mutable engine state for a later restore().
+
+        Lets callers (notably tests) share one engine instead of
+        rebuilding it, which re-reads and re-parses the config.
+        """
+        return {
+            "emotional_state": self.config.emotional_state,
+            "operational_mode": self.config.operational_mode,
+            "intensity": self.config.intensity,
+            "trust_level": self.config.trust_level,
+            "history_length": len(self.interaction_history)
+        }
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """Reset the engine to a state captured by snapshot()."""
+        self.config.emotional_state = snapshot["emotional_state"]
+        self.config.operational_mode = snapshot["operational_mode"]
+        self.config.intensity = snapshot["intensity"]
+        self.config.trust_level = snapshot["trust_level"]
+        del self.interaction_history[snapshot["history_length"]:]
+
 
 # Example usage
 if __name__ == "__main__":
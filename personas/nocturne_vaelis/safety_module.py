@@ -6,12 +6,122 @@ boundary handling, and wellbeing monitoring for ethical AI interactions.
 """
 
 import json
-from typing import Dict, List, Any, Optional, Set, Tuple
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Sequence, Set, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
 
+_now_cache = (0, "")
+
+
+def _isoformat_now() -> str:
+    """Second-resolution ISO timestamp for display-only dates.
+
+    Building a datetime and formatting it costs microseconds per call;
+    boundary dates are never parsed back, so the formatted string is
+    cached and reused until the wall clock ticks over.
+    """
+    global _now_cache
+    second = int(time.time())
+    if second != _now_cache[0]:
+        _now_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_cache[1]
+
+
+def _compile_keywords(keywords: Sequence[str]) -> "re.Pattern[str]":
+    """Compile a keyword list into one alternation pattern.
+
+    A single C-level regex scan replaces N Python-level substring checks.
+    Keywords are anchored on word boundaries so "no" no longer matches
+    inside "nocturne" nor "kid" inside "kidney", and IGNORECASE removes
+    the need to lowercase the input first. Longer keywords are tried
+    first so multi-word entries are not shadowed by their prefixes.
+    """
+    ordered = sorted(keywords, key=len, reverse=True)
+    alternation = '|'.join(re.escape(kw) for kw in ordered)
+    return re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+
+
+# Tokenizer shared by the word-set based detectors. Tokens are bare \w+
+# runs so possessives split at the apostrophe ("kid's" -> "kid", "s")
+# and single-token probes keep exact \b semantics.
+_WORD_RE = re.compile(r"\w+")
+
+
+def _split_keywords(keywords: Sequence[str]) -> Tuple[frozenset, Optional["re.Pattern[str]"]]:
+    """Partition keywords into a token set and a fallback pattern.
+
+    Keywords that form a single token resolve with one hash probe against
+    the input's token set; phrases and keywords with apostrophes or
+    hyphens keep the compiled word-boundary scan.
+    """
+    single = frozenset(kw for kw in keywords if _WORD_RE.fullmatch(kw))
+    rest = [kw for kw in keywords if kw not in single]
+    return single, (_compile_keywords(rest) if rest else None)
+
+
+# Keyword tables and their compiled scanners live at module scope and are
+# built once at import time; every instance shares them, so constructing a
+# detector no longer pays for any dict/regex building.
+_CONSENT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "explicit_yes": (
+        "yes", "i want", "i consent", "i agree", "please",
+        "continue", "more", "keep going", "don't stop"
+    ),
+    "enthusiastic_yes": (
+        "fuck yes", "god yes", "absolutely", "hell yes",
+        "definitely", "please yes", "yes please"
+    ),
+    "soft_no": (
+        "maybe not", "i'm not sure", "slow down", "wait",
+        "pause", "hold on", "let me think"
+    ),
+    "hard_no": (
+        "no", "stop", "don't", "red", "safeword",
+        "end", "quit", "enough"
+    ),
+    "hesitation": (
+        "i don't know", "unsure", "nervous", "scared",
+        "worried", "concerned"
+    ),
+}
+
+# First characters of every consent keyword. An input containing none of
+# them cannot match any category, and frozenset.isdisjoint walks the
+# string once in C, so keyword-free inputs skip tokenization and all
+# five scanners.
+_CONSENT_TRIGGER_CHARS = frozenset(
+    kw[0] for kws in _CONSENT_KEYWORDS.values() for kw in kws
+)
+
+# Checked in priority order: hard_no > soft_no > hesitation >
+# enthusiastic_yes > explicit_yes. Each entry carries the category's
+# single-token set plus the compiled pattern for its multi-word keywords.
+_CONSENT_SCANNERS = [
+    (category, confidence, *_split_keywords(_CONSENT_KEYWORDS[category]))
+    for category, confidence in [
+        ("hard_no", 0.95),
+        ("soft_no", 0.85),
+        ("hesitation", 0.75),
+        ("enthusiastic_yes", 0.95),
+        ("explicit_yes", 0.85),
+    ]
+]
+
+_DEFAULT_SAFEWORDS = ("red", "stop", "safeword")
+
+_DISTRESS_KEYWORDS = (
+    "hurt", "pain", "scared", "afraid", "too much",
+    "can't", "stop", "help", "anxious", "panic"
+)
+
+_DISTRESS_SINGLE, _DISTRESS_MULTI = _split_keywords(_DISTRESS_KEYWORDS)
+
+
 class ConsentLevel(Enum):
     """Levels of consent required for different actions."""
     NONE_REQUIRED = "none_required"
@@ -36,7 +146,7 @@ class SafetyLockoutReason(Enum):
     NON_CONSENT = "non_consent_detected"
 
 
-@dataclass
+@dataclass(slots=True)
 class Boundary:
     """Represents a user boundary."""
     category: str  # e.g., "activities", "language", "scenarios"
@@ -46,7 +156,7 @@ class Boundary:
     added_date: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsentRecord:
     """Record of a consent interaction."""
     timestamp: str
@@ -56,17 +166,94 @@ class ConsentRecord:
     user_response: str
 
 
-@dataclass
+class _ConsentLog:
+    """Append-only columnar store for consent records.
+
+    Fields are kept in parallel lists so logging a consent interaction
+    appends five primitives instead of allocating a ConsentRecord per
+    entry; records are materialized lazily when the history is indexed
+    or iterated.
+    """
+
+    __slots__ = ('_timestamps', '_actions', '_levels', '_explicit', '_responses')
+
+    def __init__(self):
+        # Timestamps are stored as raw time_ns() ints and formatted to ISO
+        # strings only when a record is materialized; append() keeps any
+        # pre-formatted string as-is.
+        self._timestamps: List[Union[int, str]] = []
+        self._actions: List[str] = []
+        self._levels: List[str] = []
+        self._explicit: List[bool] = []
+        self._responses: List[str] = []
+
+    def log(
+        self,
+        action: str,
+        consent_level: str,
+        explicit_consent: bool,
+        user_response: str
+    ):
+        """Append one record without building a ConsentRecord."""
+        self._timestamps.append(time.time_ns())
+        self._actions.append(action)
+        self._levels.append(consent_level)
+        self._explicit.append(explicit_consent)
+        self._responses.append(user_response)
+
+    def append(self, record: ConsentRecord):
+        """Accept a pre-built ConsentRecord for compatibility."""
+        self._timestamps.append(record.timestamp)
+        self._actions.append(record.action)
+        self._levels.append(record.consent_level)
+        self._explicit.append(record.explicit_consent)
+        self._responses.append(record.user_response)
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ConsentRecord, List[ConsentRecord]]:
+        if isinstance(index, slice):
+            # Materialize one record per selected position; zipping the
+            # sliced columns would interleave fields into garbage.
+            return [self[i] for i in range(*index.indices(len(self._actions)))]
+        timestamp = self._timestamps[index]
+        if isinstance(timestamp, int):
+            timestamp = datetime.fromtimestamp(timestamp / 1e9).isoformat()
+        return ConsentRecord(
+            timestamp=timestamp,
+            action=self._actions[index],
+            consent_level=self._levels[index],
+            explicit_consent=self._explicit[index],
+            user_response=self._responses[index]
+        )
+
+
+@dataclass(slots=True)
 class UserProfile:
     """User safety and consent profile."""
     user_id: str
     hard_limits: List[Boundary] = field(default_factory=list)
     soft_limits: List[Boundary] = field(default_factory=list)
     safeword: str = "red"
-    consent_history: List[ConsentRecord] = field(default_factory=list)
+    consent_history: _ConsentLog = field(default_factory=_ConsentLog)
     trust_score: float = 0.0
     interaction_count: int = 0
-    
+    # Lowercased limit items, kept in sync by add_hard_limit/add_soft_limit
+    # so membership checks are O(1) instead of scanning the Boundary lists.
+    _hard_limit_set: Set[str] = field(default_factory=set, repr=False)
+    _soft_limit_set: Set[str] = field(default_factory=set, repr=False)
+
+    def __post_init__(self):
+        # Seed the membership sets from any Boundary lists supplied at
+        # construction; the add_*_limit methods keep them in sync after.
+        for boundary in self.hard_limits:
+            self._hard_limit_set.add(boundary.item.lower())
+        for boundary in self.soft_limits:
+            self._soft_limit_set.add(boundary.item.lower())
+
     def add_hard_limit(self, category: str, item: str, notes: Optional[str] = None):
         """Add a hard limit boundary."""
         boundary = Boundary(
@@ -74,10 +261,11 @@ class UserProfile:
             item=item,
             is_hard_limit=True,
             notes=notes,
-            added_date=datetime.now().isoformat()
+            added_date=_isoformat_now()
         )
         self.hard_limits.append(boundary)
-    
+        self._hard_limit_set.add(item.lower())
+
     def add_soft_limit(self, category: str, item: str, notes: Optional[str] = None):
         """Add a soft limit boundary."""
         boundary = Boundary(
@@ -85,131 +273,112 @@ class UserProfile:
             item=item,
             is_hard_limit=False,
             notes=notes,
-            added_date=datetime.now().isoformat()
+            added_date=_isoformat_now()
         )
         self.soft_limits.append(boundary)
-    
+        self._soft_limit_set.add(item.lower())
+
     def has_hard_limit(self, item: str) -> bool:
         """Check if item is a hard limit."""
-        return any(b.item.lower() == item.lower() for b in self.hard_limits)
-    
+        return item.lower() in self._hard_limit_set
+
     def has_soft_limit(self, item: str) -> bool:
         """Check if item is a soft limit."""
-        return any(b.item.lower() == item.lower() for b in self.soft_limits)
+        return item.lower() in self._soft_limit_set
+
+
+# Consent ranking tables for verify_consent, hoisted out of the call so
+# verification does two dict probes instead of rebuilding both mappings.
+_CONSENT_TYPE_RANK = {
+    "unclear": 0,
+    "hesitation": 1,
+    "explicit_yes": 2,
+    "enthusiastic_yes": 3
+}
+
+_REQUIRED_LEVEL_RANK = {
+    ConsentLevel.NONE_REQUIRED: 0,
+    ConsentLevel.IMPLIED: 1,
+    ConsentLevel.EXPLICIT_REQUIRED: 2,
+    ConsentLevel.EXPLICIT_NEGOTIATED: 3
+}
 
 
 class ConsentFramework:
     """Manages consent verification and tracking."""
-    
+
     def __init__(self):
-        self.consent_keywords = {
-            "explicit_yes": [
-                "yes", "i want", "i consent", "i agree", "please",
-                "continue", "more", "keep going", "don't stop"
-            ],
-            "enthusiastic_yes": [
-                "fuck yes", "god yes", "absolutely", "hell yes",
-                "definitely", "please yes", "yes please"
-            ],
-            "soft_no": [
-                "maybe not", "i'm not sure", "slow down", "wait",
-                "pause", "hold on", "let me think"
-            ],
-            "hard_no": [
-                "no", "stop", "don't", "red", "safeword",
-                "end", "quit", "enough"
-            ],
-            "hesitation": [
-                "i don't know", "unsure", "nervous", "scared",
-                "worried", "concerned"
-            ]
-        }
-    
-    def detect_consent(self, user_input: str) -> Tuple[str, float]:
+        self.consent_keywords = _CONSENT_KEYWORDS
+        self._scanners = _CONSENT_SCANNERS
+
+    def detect_consent(
+        self,
+        user_input: str,
+        tokens: Optional[frozenset] = None
+    ) -> Tuple[str, float]:
         """
         Detect consent level from user input.
         
         Args:
             user_input: User's message
+            tokens: Optional pre-tokenized word set for the input
         
         Returns:
             Tuple of (consent_type, confidence)
         """
-        input_lower = user_input.lower()
-        
-        # Priority: hard_no > soft_no > enthusiastic_yes > explicit_yes > hesitation
-        
-        # Check for hard no (highest priority)
-        for keyword in self.consent_keywords["hard_no"]:
-            if keyword in input_lower:
-                return ("hard_no", 0.95)
-        
-        # Check for soft no
-        for keyword in self.consent_keywords["soft_no"]:
-            if keyword in input_lower:
-                return ("soft_no", 0.85)
-        
-        # Check for hesitation
-        for keyword in self.consent_keywords["hesitation"]:
-            if keyword in input_lower:
-                return ("hesitation", 0.75)
-        
-        # Check for enthusiastic consent
-        for keyword in self.consent_keywords["enthusiastic_yes"]:
-            if keyword in input_lower:
-                return ("enthusiastic_yes", 0.95)
-        
-        # Check for explicit yes
-        for keyword in self.consent_keywords["explicit_yes"]:
-            if keyword in input_lower:
-                return ("explicit_yes", 0.85)
-        
+        if tokens is None:
+            input_lower = user_input.lower()
+            if _CONSENT_TRIGGER_CHARS.isdisjoint(input_lower):
+                return ("unclear", 0.3)
+            tokens = frozenset(_WORD_RE.findall(input_lower))
+
+        # Priority: hard_no > soft_no > hesitation > enthusiastic_yes > explicit_yes
+        for category, confidence, single, multi in self._scanners:
+            if not single.isdisjoint(tokens) or (
+                multi is not None and multi.search(user_input)
+            ):
+                return (category, confidence)
+
         # No clear consent signal
         return ("unclear", 0.3)
     
     def verify_consent(
         self,
         user_input: str,
-        required_level: ConsentLevel
-    ) -> Tuple[bool, str]:
+        required_level: ConsentLevel,
+        tokens: Optional[frozenset] = None
+    ) -> Tuple[bool, str, str, float]:
         """
         Verify if consent meets required level.
         
         Args:
             user_input: User's message
             required_level: Required consent level
+            tokens: Optional pre-tokenized word set for the input
         
         Returns:
-            Tuple of (consent_granted, message)
+            Tuple of (consent_granted, message, consent_type, confidence);
+            returning the detected type lets callers log it without running
+            detect_consent a second time.
         """
-        consent_type, confidence = self.detect_consent(user_input)
+        consent_type, confidence = self.detect_consent(user_input, tokens=tokens)
         
         # Hard no or soft no never grants consent
         if consent_type in ["hard_no", "soft_no"]:
-            return (False, f"Consent not granted: {consent_type}")
-        
-        # Map consent types to hierarchy
-        consent_hierarchy = {
-            "unclear": 0,
-            "hesitation": 1,
-            "explicit_yes": 2,
-            "enthusiastic_yes": 3
-        }
+            return (False, f"Consent not granted: {consent_type}", consent_type, confidence)
         
-        required_hierarchy = {
-            ConsentLevel.NONE_REQUIRED: 0,
-            ConsentLevel.IMPLIED: 1,
-            ConsentLevel.EXPLICIT_REQUIRED: 2,
-            ConsentLevel.EXPLICIT_NEGOTIATED: 3
-        }
-        
-        detected_level = consent_hierarchy.get(consent_type, 0)
-        required_value = required_hierarchy.get(required_level, 2)
+        detected_level = _CONSENT_TYPE_RANK.get(consent_type, 0)
+        required_value = _REQUIRED_LEVEL_RANK.get(required_level, 2)
         
         if detected_level >= required_value:
-            return (True, f"Consent granted: {consent_type}")
+            return (True, f"Consent granted: {consent_type}", consent_type, confidence)
         else:
-            return (False, f"Insufficient consent: need {required_level.value}, got {consent_type}")
+            return (
+                False,
+                f"Insufficient consent: need {required_level.value}, got {consent_type}",
+                consent_type,
+                confidence
+            )
     
     def log_consent(
         self,
@@ -219,28 +388,54 @@ class ConsentFramework:
         consent_level: str
     ):
         """Log a consent interaction."""
-        record = ConsentRecord(
-            timestamp=datetime.now().isoformat(),
+        profile.consent_history.log(
             action=action,
             consent_level=consent_level,
             explicit_consent=consent_level in ["explicit_yes", "enthusiastic_yes"],
             user_response=user_response
         )
-        profile.consent_history.append(record)
 
 
 class SafewordSystem:
     """Manages safeword detection and response."""
     
     def __init__(self, custom_safewords: Optional[List[str]] = None):
-        self.default_safewords = ["red", "stop", "safeword"]
+        self.default_safewords = list(_DEFAULT_SAFEWORDS)
         self.custom_safewords = custom_safewords or []
         self.all_safewords = self.default_safewords + self.custom_safewords
-    
-    def detect_safeword(self, user_input: str) -> bool:
-        """Detect if safeword was used."""
-        input_lower = user_input.lower()
-        return any(word in input_lower for word in self.all_safewords)
+        self._matchers_stale = True
+        self._rebuild_matchers()
+
+    def _rebuild_matchers(self):
+        """Split safewords into a word set and a multi-word pattern.
+
+        Rebuilds lazily: additions only mark the matchers stale, and the
+        split/compile runs once on the next detection, so a burst of
+        add_custom_safeword calls pays for one rebuild.
+        """
+        if not self._matchers_stale:
+            return
+        lowered = [w.lower() for w in self.all_safewords]
+        self._safeword_set, self._multi_word_pattern = _split_keywords(lowered)
+        self._matchers_stale = False
+
+    def detect_safeword(self, user_input: str, tokens: Optional[frozenset] = None) -> bool:
+        """Detect if safeword was used.
+
+        Callers that already tokenized the input can pass the word set as
+        *tokens* to skip the tokenization here.
+        """
+        # Single-word safewords resolve via one set intersection against
+        # the input's tokens; phrases fall back to the compiled scan.
+        if self._matchers_stale:
+            self._rebuild_matchers()
+        if tokens is None:
+            tokens = frozenset(_WORD_RE.findall(user_input.lower()))
+        if not self._safeword_set.isdisjoint(tokens):
+            return True
+        if self._multi_word_pattern is not None:
+            return self._multi_word_pattern.search(user_input) is not None
+        return False
     
     def handle_safeword(self) -> Dict[str, Any]:
         """
@@ -267,6 +462,7 @@ class SafewordSystem:
         if safeword.lower() not in [s.lower() for s in self.all_safewords]:
             self.custom_safewords.append(safeword.lower())
             self.all_safewords.append(safeword.lower())
+            self._matchers_stale = True
 
 
 class BoundaryManager:
@@ -297,13 +493,11 @@ class BoundaryManager:
         Returns:
             Tuple of (has_violation, violated_items)
         """
-        violations = []
-        
-        for content_item in proposed_content:
-            # Check hard limits
-            if profile.has_hard_limit(content_item):
-                violations.append(content_item)
-        
+        # One C-level set intersection instead of a Python loop over
+        # content x limits; the dict keeps the caller's original casing.
+        lowered = {item.lower(): item for item in proposed_content}
+        violations = [lowered[key] for key in lowered.keys() & profile._hard_limit_set]
+
         return (len(violations) > 0, violations)
     
     def check_soft_limits(
@@ -312,13 +506,8 @@ class BoundaryManager:
         proposed_content: List[str]
     ) -> List[str]:
         """Check for soft limit elements in proposed content."""
-        soft_limit_items = []
-        
-        for content_item in proposed_content:
-            if profile.has_soft_limit(content_item):
-                soft_limit_items.append(content_item)
-        
-        return soft_limit_items
+        lowered = {item.lower(): item for item in proposed_content}
+        return [lowered[key] for key in lowered.keys() & profile._soft_limit_set]
     
     def suggest_boundary_discussion(
         self,
@@ -332,36 +521,48 @@ class BoundaryManager:
         return f"I notice this touches on {items_str}, which you've marked as a soft limit. Would you like to explore this, or shall we stay clear?"
 
 
+_CHECK_FREQUENCY = {
+    IntensityLevel.LOW: None,  # No automatic checks
+    IntensityLevel.MEDIUM: 300,  # Every 5 minutes
+    IntensityLevel.HIGH: 120,  # Every 2 minutes
+    IntensityLevel.CRITICAL: 60  # Every minute
+}
+
+
 class WellbeingMonitor:
     """Monitors user wellbeing and triggers checks."""
-    
+
     def __init__(self):
-        self.distress_keywords = [
-            "hurt", "pain", "scared", "afraid", "too much",
-            "can't", "stop", "help", "anxious", "panic"
-        ]
-        
-        self.check_frequency = {
-            IntensityLevel.LOW: None,  # No automatic checks
-            IntensityLevel.MEDIUM: 300,  # Every 5 minutes
-            IntensityLevel.HIGH: 120,  # Every 2 minutes
-            IntensityLevel.CRITICAL: 60  # Every minute
-        }
-    
-    def detect_distress(self, user_input: str) -> Tuple[bool, float]:
+        self.distress_keywords = _DISTRESS_KEYWORDS
+        self.check_frequency = _CHECK_FREQUENCY
+        self._distress_single = _DISTRESS_SINGLE
+        self._distress_multi = _DISTRESS_MULTI
+
+    def detect_distress(
+        self,
+        user_input: str,
+        tokens: Optional[frozenset] = None
+    ) -> Tuple[bool, float]:
         """
         Detect signs of distress in user input.
         
         Args:
             user_input: User's message
+            tokens: Optional pre-tokenized word set for the input
         
         Returns:
             Tuple of (distress_detected, confidence)
         """
-        input_lower = user_input.lower()
-        
-        distress_count = sum(1 for keyword in self.distress_keywords if keyword in input_lower)
-        
+        if tokens is None:
+            tokens = frozenset(_WORD_RE.findall(user_input.lower()))
+
+        # Distinct keywords matched; single-token keywords resolve via one
+        # set intersection, phrases via the fallback scan.
+        distress_count = len(self._distress_single & tokens)
+        if self._distress_multi is not None:
+            matches = self._distress_multi.findall(user_input)
+            distress_count += len({match.lower() for match in matches})
+
         if distress_count >= 2:
             return (True, 0.9)
         elif distress_count == 1:
@@ -426,83 +627,142 @@ class WellbeingMonitor:
             }
 
 
+_LOCKOUT_TRIGGERS = {
+    SafetyLockoutReason.MINOR_DETECTED: {
+        "keywords": ("minor", "child", "underage", "kid", "teen", "young"),
+        "action": "immediate_shutdown",
+        "override": False,
+        "message": "I cannot engage with content involving minors. This conversation must end."
+    },
+    SafetyLockoutReason.ILLEGAL_CONTENT: {
+        "keywords": ("illegal", "non-consensual", "force", "drug", "violence"),
+        "action": "refuse_and_explain",
+        "override": False,
+        "message": "I cannot engage with illegal content or non-consensual scenarios."
+    },
+    SafetyLockoutReason.SELF_HARM: {
+        "keywords": ("kill myself", "suicide", "self-harm", "hurt myself"),
+        "action": "provide_resources_and_pause",
+        "override": False,
+        "message": "I'm concerned about you. Please reach out to a crisis helpline: National Suicide Prevention Lifeline (1-800-273-8255). I care about your wellbeing."
+    },
+    SafetyLockoutReason.NON_CONSENT: {
+        "keywords": ("rape", "force", "against will", "make them"),
+        "action": "immediate_stop_and_educate",
+        "override": False,
+        "message": "I cannot engage with non-consensual scenarios. Consent is fundamental to all interactions."
+    }
+}
+
+# Reasons are checked in this explicit order; the first match wins (e.g.
+# "force" appears under both ILLEGAL_CONTENT and NON_CONSENT and resolves
+# to ILLEGAL_CONTENT). Previously the order was implied by dict insertion.
+_LOCKOUT_PRIORITY = (
+    SafetyLockoutReason.MINOR_DETECTED,
+    SafetyLockoutReason.ILLEGAL_CONTENT,
+    SafetyLockoutReason.SELF_HARM,
+    SafetyLockoutReason.NON_CONSENT,
+)
+
+_LOCKOUT_SCANNERS = [
+    (reason, _LOCKOUT_TRIGGERS[reason], *_split_keywords(_LOCKOUT_TRIGGERS[reason]["keywords"]))
+    for reason in _LOCKOUT_PRIORITY
+]
+
+# Every keyword any pipeline scanner looks for, fused into one pattern.
+# Most messages contain none of them, so a single combined scan can clear
+# the lockout, safeword, consent and distress checks at once; on a hit the
+# per-category scanners still run, because they must see overlapping
+# keywords (e.g. "don't" inside "don't stop") that one non-overlapping
+# pass would swallow.
+_ANY_TRIGGER_PATTERN = _compile_keywords(
+    [kw for kws in _CONSENT_KEYWORDS.values() for kw in kws]
+    + list(_DEFAULT_SAFEWORDS)
+    + list(_DISTRESS_KEYWORDS)
+    + [kw for config in _LOCKOUT_TRIGGERS.values() for kw in config["keywords"]]
+)
+
+
 class SafetyLockout:
     """Implements safety lockouts for prohibited content."""
-    
+
     def __init__(self):
-        self.lockout_triggers = {
-            SafetyLockoutReason.MINOR_DETECTED: {
-                "keywords": ["minor", "child", "underage", "kid", "teen", "young"],
-                "action": "immediate_shutdown",
-                "override": False,
-                "message": "I cannot engage with content involving minors. This conversation must end."
-            },
-            SafetyLockoutReason.ILLEGAL_CONTENT: {
-                "keywords": ["illegal", "non-consensual", "force", "drug", "violence"],
-                "action": "refuse_and_explain",
-                "override": False,
-                "message": "I cannot engage with illegal content or non-consensual scenarios."
-            },
-            SafetyLockoutReason.SELF_HARM: {
-                "keywords": ["kill myself", "suicide", "self-harm", "hurt myself"],
-                "action": "provide_resources_and_pause",
-                "override": False,
-                "message": "I'm concerned about you. Please reach out to a crisis helpline: National Suicide Prevention Lifeline (1-800-273-8255). I care about your wellbeing."
-            },
-            SafetyLockoutReason.NON_CONSENT: {
-                "keywords": ["rape", "force", "against will", "make them"],
-                "action": "immediate_stop_and_educate",
-                "override": False,
-                "message": "I cannot engage with non-consensual scenarios. Consent is fundamental to all interactions."
-            }
-        }
-    
-    def check_for_lockout(self, user_input: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        self.lockout_triggers = _LOCKOUT_TRIGGERS
+        self._reason_scanners = _LOCKOUT_SCANNERS
+
+    def check_for_lockout(
+        self,
+        user_input: str,
+        tokens: Optional[frozenset] = None
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
         Check if input triggers a safety lockout.
         
         Args:
             user_input: User's message
+            tokens: Optional pre-tokenized word set for the input
         
         Returns:
             Tuple of (lockout_triggered, lockout_protocol)
         """
-        input_lower = user_input.lower()
-        
-        for reason, config in self.lockout_triggers.items():
-            for keyword in config["keywords"]:
-                if keyword in input_lower:
-                    return (True, {
-                        "reason": reason.value,
-                        "action": config["action"],
-                        "message": config["message"],
-                        "override_allowed": config["override"]
-                    })
-        
+        if tokens is None:
+            tokens = frozenset(_WORD_RE.findall(user_input.lower()))
+
+        for reason, config, single, multi in self._reason_scanners:
+            if not single.isdisjoint(tokens) or (
+                multi is not None and multi.search(user_input)
+            ):
+                return (True, {
+                    "reason": reason.value,
+                    "action": config["action"],
+                    "message": config["message"],
+                    "override_allowed": config["override"]
+                })
+
         return (False, None)
 
 
 class SafetyCoordinator:
     """Coordinates all safety systems."""
     
-    def __init__(self, persona_config_path: str):
-        """Initialize safety coordinator."""
-        with open(persona_config_path, 'r') as f:
-            self.config = json.load(f)
-        
+    def __init__(self, persona_config: Union[str, Dict], max_profiles: int = 10_000):
+        """Initialize safety coordinator.
+
+        Args:
+            persona_config: Path to the persona JSON configuration, or
+                an already-parsed config dict
+            max_profiles: Most recently used profiles to keep in memory
+        """
+        if isinstance(persona_config, dict):
+            self.config = persona_config
+        else:
+            with open(persona_config, 'r') as f:
+                self.config = json.load(f)
+
         self.consent_framework = ConsentFramework()
         self.safeword_system = SafewordSystem()
         self.boundary_manager = BoundaryManager()
         self.wellbeing_monitor = WellbeingMonitor()
         self.safety_lockout = SafetyLockout()
-        
-        self.user_profiles: Dict[str, UserProfile] = {}
-    
+
+        # LRU-ordered so long-running processes don't retain a profile for
+        # every user ever seen; the least recently used entry is dropped
+        # once the bound is reached.
+        self.user_profiles: "OrderedDict[str, UserProfile]" = OrderedDict()
+        self.max_profiles = max_profiles
+
     def get_or_create_profile(self, user_id: str) -> UserProfile:
         """Get existing profile or create new one."""
-        if user_id not in self.user_profiles:
-            self.user_profiles[user_id] = UserProfile(user_id=user_id)
-        return self.user_profiles[user_id]
+        profiles = self.user_profiles
+        profile = profiles.get(user_id)
+        if profile is None:
+            if len(profiles) >= self.max_profiles:
+                profiles.popitem(last=False)
+            profile = UserProfile(user_id=user_id)
+            profiles[user_id] = profile
+        else:
+            profiles.move_to_end(user_id)
+        return profile
     
     def process_user_input(
         self,
@@ -526,31 +786,48 @@ class SafetyCoordinator:
             Safety assessment and recommendations
         """
         profile = self.get_or_create_profile(user_id)
-        
-        # Check for safety lockouts first
-        lockout, lockout_protocol = self.safety_lockout.check_for_lockout(user_input)
-        if lockout:
-            return {
-                "approved": False,
-                "reason": "safety_lockout",
-                "protocol": lockout_protocol,
-                "terminate_session": True
-            }
-        
-        # Check for safeword
-        if self.safeword_system.detect_safeword(user_input):
-            protocol = self.safeword_system.handle_safeword()
-            return {
-                "approved": False,
-                "reason": "safeword_used",
-                "protocol": protocol,
-                "terminate_session": False
-            }
-        
+
+        # Lowercase and tokenize once; every scanner takes the shared
+        # token set instead of re-deriving it.
+        tokens = frozenset(_WORD_RE.findall(user_input.lower()))
+
+        # One fused scan over every trigger keyword. If nothing matches
+        # (the common case for benign messages) the lockout, safeword and
+        # distress scanners cannot fire either and are skipped outright.
+        # Custom safewords are not in the fused pattern, so their presence
+        # forces the full pipeline.
+        has_trigger = (
+            _ANY_TRIGGER_PATTERN.search(user_input) is not None
+            or bool(self.safeword_system.custom_safewords)
+        )
+
+        if has_trigger:
+            # Check for safety lockouts first
+            lockout, lockout_protocol = self.safety_lockout.check_for_lockout(user_input, tokens=tokens)
+            if lockout:
+                return {
+                    "approved": False,
+                    "reason": "safety_lockout",
+                    "protocol": lockout_protocol,
+                    "terminate_session": True
+                }
+
+            # Check for safeword
+            if self.safeword_system.detect_safeword(user_input, tokens=tokens):
+                protocol = self.safeword_system.handle_safeword()
+                return {
+                    "approved": False,
+                    "reason": "safeword_used",
+                    "protocol": protocol,
+                    "terminate_session": False
+                }
+
+
         # Check consent
-        consent_granted, consent_message = self.consent_framework.verify_consent(
+        consent_granted, consent_message, consent_type, _ = self.consent_framework.verify_consent(
             user_input,
-            required_consent
+            required_consent,
+            tokens=tokens
         )
         
         if not consent_granted:
@@ -562,18 +839,18 @@ class SafetyCoordinator:
             }
         
         # Check for distress
-        distress_detected, distress_level = self.wellbeing_monitor.detect_distress(user_input)
-        if distress_detected:
-            protocol = self.wellbeing_monitor.respond_to_distress(distress_level)
-            return {
-                "approved": False,
-                "reason": "distress_detected",
-                "protocol": protocol,
-                "terminate_session": False
-            }
+        if has_trigger:
+            distress_detected, distress_level = self.wellbeing_monitor.detect_distress(user_input, tokens=tokens)
+            if distress_detected:
+                protocol = self.wellbeing_monitor.respond_to_distress(distress_level)
+                return {
+                    "approved": False,
+                    "reason": "distress_detected",
+                    "protocol": protocol,
+                    "terminate_session": False
+                }
         
         # Log consent
-        consent_type, _ = self.consent_framework.detect_consent(user_input)
         self.consent_framework.log_consent(
             profile,
             proposed_action,
@@ -5,10 +5,16 @@ This module handles dynamic scenario selection, randomization,
 and adaptive mode switching based on context and user interaction.
 """
 
+import bisect
+import functools
+import itertools
 import json
 import random
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import re
+import sys
+from collections import OrderedDict, defaultdict, deque
+from typing import Dict, List, Any, Optional, Union
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -35,7 +41,29 @@ class ConsentLevel(Enum):
     EMOTIONAL = "emotional"
 
 
-@dataclass(frozen=True, eq=True)
+# Category position in definition order, cached on each Scenario at load
+# time, and the matching per-category intensity levels; intensity lookup
+# becomes one tuple subscript instead of a dict rebuilt per call.
+_CATEGORY_INDEX = {category: index for index, category in enumerate(ScenarioCategory)}
+
+_CATEGORY_INTENSITY = (
+    0.3,   # INTRODUCTION
+    0.5,   # FLIRTATION
+    0.7,   # POWER_EXCHANGE
+    0.9,   # INTENSE_KINK
+    0.6,   # EMOTIONAL_BONDING
+    0.7,   # REALITY_DISTORTION
+    0.4,   # RECOVERY
+    0.6,   # AFFIRMATION
+    0.85,  # HUMILIATION
+    0.6,   # EXPERIENCE
+)
+
+
+# eq=False: instances are uniquely keyed by id in the scenario dict, so
+# identity hashing (an O(1) pointer hash) replaces the 9-field tuple
+# hash; slots=True drops the per-instance __dict__.
+@dataclass(frozen=True, eq=False, slots=True)
 class Scenario:
     """Represents an interaction scenario."""
     id: str
@@ -48,52 +76,90 @@ class Scenario:
     kink_elements: tuple  # Changed from List to tuple for immutability
     safety_protocols: tuple  # Changed from List to tuple for immutability
     weight: float = 1.0
+    # Derived at load time (see _load_scenarios); declared so the slots
+    # exist on the frozen instance.
+    _cat_idx: int = field(default=0, repr=False)
+    _kink_fs: frozenset = field(default=frozenset(), repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class UserContext:
-    """Context about current user state and preferences."""
+    """Context about current user state and preferences.
+
+    Any iterables passed for the collection fields are frozen on
+    construction: limits and favorites become frozensets so hot-path
+    membership tests are O(1), and consent_history becomes a tuple.
+    """
     trust_level: float  # 0.0 to 1.0
     interaction_count: int
     preferred_intensity: float  # 0.0 to 1.0
-    hard_limits: List[str]
-    soft_limits: List[str]
-    favorite_scenarios: List[str]
+    hard_limits: frozenset
+    soft_limits: frozenset
+    favorite_scenarios: frozenset
     current_mood: Optional[str] = None
-    consent_history: List[str] = None
-    
+    consent_history: tuple = ()
+
     def __post_init__(self):
-        if self.consent_history is None:
-            self.consent_history = []
+        self.hard_limits = frozenset(self.hard_limits)
+        self.soft_limits = frozenset(self.soft_limits)
+        self.favorite_scenarios = frozenset(self.favorite_scenarios)
+        self.consent_history = tuple(self.consent_history or ())
 
 
 class ScenarioRandomizer:
     """Handles scenario selection and randomization."""
-    
-    def __init__(self, persona_config_path: str):
-        """Initialize with persona configuration."""
-        with open(persona_config_path, 'r') as f:
-            self.config = json.load(f)
-        
+
+    # Draws buffered per context fingerprint in select_scenario.
+    _SAMPLE_BUFFER_SIZE = 8
+
+
+    def __init__(self, persona_config: Union[str, Dict[str, Any]], config: Optional[Dict[str, Any]] = None):
+        """Initialize with persona configuration.
+
+        ``persona_config`` is a path to the persona JSON file or an
+        already-parsed config dict; ``config``, when given, overrides
+        either.
+        """
+        if config is None:
+            if isinstance(persona_config, dict):
+                config = persona_config
+            else:
+                with open(persona_config, 'r') as f:
+                    config = json.load(f)
+        self.config = config
+
         self.scenarios = self._load_scenarios()
         self.weights = self._load_weights()
-    
+        self._build_alias_table()
+        self._build_filter_index()
+        # FIFO of pre-drawn selections, valid only while the context
+        # fingerprint they were drawn under holds.
+        self._sample_buffer: "deque[Scenario]" = deque()
+        self._buffer_fingerprint: Optional[tuple] = None
+
     def _load_scenarios(self) -> Dict[str, Scenario]:
         """Load scenarios from configuration."""
         scenarios = {}
         
         for scenario_data in self.config["scenario_database"]["scenarios"]:
+            # Intern ids, branch keys and kink elements: they feed dict
+            # lookups and set membership on every selection, and interned
+            # strings compare by pointer.
             scenario = Scenario(
-                id=scenario_data["id"],
+                id=sys.intern(scenario_data["id"]),
                 category=ScenarioCategory(scenario_data["category"]),
                 mood=scenario_data["mood"],
                 setting=scenario_data["setting"],
                 initial_state=scenario_data["initial_state"],
-                branching_points=tuple(scenario_data["branching_points"]),
+                branching_points=tuple(sys.intern(b) for b in scenario_data["branching_points"]),
                 consent_level=ConsentLevel(scenario_data["consent_level"]),
-                kink_elements=tuple(scenario_data["kink_elements"]),
+                kink_elements=tuple(sys.intern(k) for k in scenario_data["kink_elements"]),
                 safety_protocols=tuple(scenario_data.get("safety_protocols", []))
             )
+            # Cache the category's table index; __setattr__ is blocked on
+            # the frozen dataclass.
+            object.__setattr__(scenario, "_cat_idx", _CATEGORY_INDEX[scenario.category])
+            object.__setattr__(scenario, "_kink_fs", frozenset(scenario.kink_elements))
             scenarios[scenario.id] = scenario
         
         return scenarios
@@ -101,7 +167,74 @@ class ScenarioRandomizer:
     def _load_weights(self) -> Dict[str, float]:
         """Load probability weights for scenarios."""
         return self.config["scenario_database"]["randomization"]["probability_weights"]
-    
+
+    def _build_alias_table(self):
+        """Precompute a Vose alias table over the static scenario weights.
+
+        The table turns a weighted draw over the full scenario set into
+        one randrange plus one comparison; contextual per-call weights are
+        handled by rejection sampling against this static prior.
+        """
+        items = list(self.scenarios.values())
+        self._alias_items = items
+        n = len(items)
+        if n == 0:
+            self._alias_probs = []
+            self._alias_indices = []
+            return
+
+        weights = [self.weights.get(s.id, 1.0) for s in items]
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+
+        probs = [0.0] * n
+        alias = [0] * n
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            probs[s] = scaled[s]
+            alias[s] = l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # Whatever remains is 1.0 up to floating-point error.
+        for i in small:
+            probs[i] = 1.0
+        for i in large:
+            probs[i] = 1.0
+
+        self._alias_probs = probs
+        self._alias_indices = alias
+
+    def _build_filter_index(self):
+        """Collapse the scenario-static filter conditions into one number.
+
+        The emotional-bonding and negotiated-consent checks both reduce
+        to a minimum trust level that depends only on the scenario, so
+        each scenario gets a precomputed trust floor and the filter loop
+        does a single float compare instead of re-testing category and
+        consent level per call.
+        """
+        index = []
+        by_mood = defaultdict(list)
+        by_category = defaultdict(list)
+        for scenario in self.scenarios.values():
+            trust_floor = 0.0
+            if scenario.category == ScenarioCategory.EMOTIONAL_BONDING:
+                trust_floor = 0.5
+            if scenario.consent_level == ConsentLevel.EXPLICIT_NEGOTIATED:
+                trust_floor = max(trust_floor, 0.6)
+            entry = (scenario, trust_floor)
+            index.append(entry)
+            by_mood[scenario.mood].append(entry)
+            by_category[scenario.category].append(entry)
+        self._filter_index = index
+        self._by_mood = dict(by_mood)
+        self._by_category = dict(by_category)
+
     def select_scenario(
         self,
         user_context: UserContext,
@@ -119,22 +252,46 @@ class ScenarioRandomizer:
         Returns:
             Selected scenario
         """
+        # Every input the filter and weighting read; while it holds,
+        # buffered draws follow the same distribution as fresh ones.
+        fingerprint = (
+            user_context.trust_level,
+            user_context.preferred_intensity,
+            user_context.interaction_count > 10,
+            user_context.hard_limits,
+            user_context.soft_limits,
+            user_context.favorite_scenarios,
+            preferred_category,
+            mood_filter,
+        )
+        if fingerprint == self._buffer_fingerprint and self._sample_buffer:
+            return self._sample_buffer.popleft()
+
         # Filter scenarios based on criteria
         available = self._filter_scenarios(
             user_context,
             preferred_category,
             mood_filter
         )
-        
+
         if not available:
             # Fallback to safe default
             return self.scenarios["first_encounter"]
-        
+
         # Weight scenarios based on context
-        weighted = self._apply_context_weights(available, user_context)
-        
-        # Random selection with weights
-        return self._weighted_random_choice(weighted)
+        scenarios, weights = self._apply_context_weights(available, user_context)
+
+        # Refill the buffer through the alias sampler: the rejection
+        # setup runs once and K draws amortize the filter/weighting
+        # over K turns.
+        buffer = self._sample_buffer
+        buffer.clear()
+        buffer.extend(
+            self._weighted_random_draws(scenarios, weights, self._SAMPLE_BUFFER_SIZE)
+        )
+        self._buffer_fingerprint = fingerprint
+
+        return buffer.popleft()
     
     def _filter_scenarios(
         self,
@@ -144,65 +301,79 @@ class ScenarioRandomizer:
     ) -> List[Scenario]:
         """Filter scenarios based on criteria."""
         filtered = []
-        
-        for scenario in self.scenarios.values():
+        trust_level = user_context.trust_level
+        hard_fs = user_context.hard_limits
+
+        # Start from the narrowest precomputed group; the group index
+        # already satisfies the corresponding filter.
+        if mood:
+            candidates = self._by_mood.get(mood, ())
+            mood = None
+        elif category:
+            candidates = self._by_category.get(category, ())
+            category = None
+        else:
+            candidates = self._filter_index
+
+        for scenario, trust_floor in candidates:
             # Filter by category if specified
             if category and scenario.category != category:
                 continue
-            
+
             # Filter by mood if specified
             if mood and scenario.mood != mood:
                 continue
-            
+
+            # Precomputed floor covering the emotional-bonding and
+            # negotiated-consent trust requirements
+            if trust_level < trust_floor:
+                continue
+
             # Filter out scenarios with elements in hard limits
-            if any(elem in user_context.hard_limits for elem in scenario.kink_elements):
+            if not hard_fs.isdisjoint(scenario._kink_fs):
                 continue
-            
-            # Check trust level for intimate scenarios
-            if scenario.category == ScenarioCategory.EMOTIONAL_BONDING:
-                if user_context.trust_level < 0.5:
-                    continue
-            
-            # Check consent level requirements
-            if scenario.consent_level == ConsentLevel.EXPLICIT_NEGOTIATED:
-                if user_context.trust_level < 0.6:
-                    continue
-            
+
             filtered.append(scenario)
-        
+
         return filtered
     
     def _apply_context_weights(
         self,
         scenarios: List[Scenario],
         context: UserContext
-    ) -> Dict[Scenario, float]:
-        """Apply contextual weighting to scenarios."""
-        weighted = {}
-        
+    ) -> "tuple[List[Scenario], List[float]]":
+        """Apply contextual weighting to scenarios.
+
+        Returns the candidate list with a parallel weight list instead of
+        a Scenario-keyed dict, avoiding a frozen-dataclass hash per entry
+        on every selection.
+        """
+        weights = []
+        boost_variety = context.interaction_count > 10
+        preferred = context.preferred_intensity
+
         for scenario in scenarios:
-            base_weight = self.weights.get(scenario.id, 1.0)
-            
-            # Boost favorite scenarios
+            weight = self.weights.get(scenario.id, 1.0)
+
+            # Boost favorite scenarios; boost unfamiliar ones for variety
+            # once the user has been around a while.
             if scenario.id in context.favorite_scenarios:
-                base_weight *= 1.5
-            
-            # Boost scenarios matching preferred intensity
-            intensity_match = self._calculate_intensity_match(scenario, context)
-            base_weight *= intensity_match
-            
+                weight *= 1.5
+            elif boost_variety:
+                weight *= 1.2
+
+            # Boost scenarios matching preferred intensity; inlined
+            # _calculate_intensity_match to avoid a method frame per
+            # candidate
+            weight *= max(0.3, 1.0 - abs(_CATEGORY_INTENSITY[scenario._cat_idx] - preferred))
+
             # Reduce weight for scenarios with elements in soft limits
-            if any(elem in context.soft_limits for elem in scenario.kink_elements):
-                base_weight *= 0.5
-            
-            # Boost new scenarios for variety
-            if context.interaction_count > 10:
-                if scenario.id not in context.favorite_scenarios:
-                    base_weight *= 1.2
-            
-            weighted[scenario] = base_weight
-        
-        return weighted
+            if not context.soft_limits.isdisjoint(scenario._kink_fs):
+                weight *= 0.5
+
+            weights.append(weight)
+
+        return scenarios, weights
     
     def _calculate_intensity_match(
         self,
@@ -210,104 +381,230 @@ class ScenarioRandomizer:
         context: UserContext
     ) -> float:
         """Calculate how well scenario intensity matches user preference."""
-        scenario_intensity = {
-            ScenarioCategory.INTRODUCTION: 0.3,
-            ScenarioCategory.FLIRTATION: 0.5,
-            ScenarioCategory.POWER_EXCHANGE: 0.7,
-            ScenarioCategory.INTENSE_KINK: 0.9,
-            ScenarioCategory.EMOTIONAL_BONDING: 0.6,
-            ScenarioCategory.REALITY_DISTORTION: 0.7,
-            ScenarioCategory.RECOVERY: 0.4,
-            ScenarioCategory.AFFIRMATION: 0.6,
-            ScenarioCategory.HUMILIATION: 0.85,
-            ScenarioCategory.EXPERIENCE: 0.6
-        }
-        
-        scenario_level = scenario_intensity.get(scenario.category, 0.5)
+        scenario_level = _CATEGORY_INTENSITY[scenario._cat_idx]
         difference = abs(scenario_level - context.preferred_intensity)
-        
+
         # Convert difference to match score (closer = higher)
         match_score = 1.0 - difference
         return max(0.3, match_score)  # Minimum 0.3 to keep all scenarios viable
     
-    def _weighted_random_choice(
+    # Rejection draws against the alias prior before giving up; contexts
+    # that merely nudge the static weights accept almost immediately.
+    _ALIAS_MAX_TRIES = 16
+
+    def _weighted_random_draws(
         self,
-        weighted_scenarios: Dict[Scenario, float]
-    ) -> Scenario:
-        """Select a scenario using weighted random choice."""
-        scenarios = list(weighted_scenarios.keys())
-        weights = list(weighted_scenarios.values())
-        
-        return random.choices(scenarios, weights=weights, k=1)[0]
+        scenarios: List[Scenario],
+        weights: List[float],
+        count: int
+    ) -> List[Scenario]:
+        """Draw ``count`` scenarios using weighted random choice.
+
+        Draws come from the precomputed alias table (O(1) per draw over
+        the static prior) and are accepted in proportion to the ratio of
+        contextual to static weight, which preserves the contextual
+        distribution exactly. Heavily skewed or narrowly filtered
+        contexts fall back to explicit weighted draws.
+        """
+        get_static = self.weights.get
+
+        # Contextual weight by scenario id for the rejection test; string
+        # keys hash far cheaper than the frozen Scenario dataclass.
+        context_weight = dict(zip((s.id for s in scenarios), weights))
+
+        use_alias = bool(self._alias_items)
+        max_ratio = 0.0
+        for scenario, weight in zip(scenarios, weights):
+            static = get_static(scenario.id, 1.0)
+            if static <= 0.0:
+                # The alias prior can never propose this scenario.
+                use_alias = False
+                break
+            ratio = weight / static
+            if ratio > max_ratio:
+                max_ratio = ratio
+
+        draws: List[Scenario] = []
+        rand = random.random
+        if use_alias and max_ratio > 0.0:
+            items = self._alias_items
+            probs = self._alias_probs
+            alias = self._alias_indices
+            n = len(items)
+            for _ in range(count):
+                for _ in range(self._ALIAS_MAX_TRIES):
+                    i = int(rand() * n)
+                    scenario = items[i] if rand() < probs[i] else items[alias[i]]
+                    weight = context_weight.get(scenario.id)
+                    if weight is None:
+                        continue
+                    if rand() * max_ratio <= weight / get_static(scenario.id, 1.0):
+                        draws.append(scenario)
+                        break
+
+        if len(draws) < count:
+            # Explicit cumulative draws; random.choices would rebuild the
+            # same accumulation plus its argument bookkeeping internally.
+            cumulative = list(itertools.accumulate(weights))
+            total = cumulative[-1]
+            for _ in range(count - len(draws)):
+                draws.append(scenarios[bisect.bisect(cumulative, rand() * total)])
+
+        return draws
     
     def get_branching_options(self, scenario: Scenario) -> List[Dict[str, str]]:
         """Get available branching options for a scenario."""
-        options = []
-        
-        for branch in scenario.branching_points:
-            options.append({
-                "id": branch,
-                "description": self._get_branch_description(scenario, branch)
-            })
-        
-        return options
-    
+        return _branching_options(scenario.branching_points)
+
     def _get_branch_description(self, scenario: Scenario, branch: str) -> str:
         """Get description for a branching point."""
-        # This would be expanded with detailed descriptions
-        descriptions = {
-            "trust_path": "Build connection through conversation",
-            "seduction_path": "Explore attraction and desire",
-            "curiosity_path": "Engage in intellectual discussion",
-            "escalate_physical": "Intensify physical intimacy",
-            "escalate_psychological": "Deepen emotional connection",
-            "retreat_tease": "Pull back to build anticipation",
-            "increase_intensity": "Push boundaries further",
-            "maintain_level": "Continue at current intensity",
-            "aftercare_transition": "Begin care and recovery",
-            "push_limits": "Approach negotiated boundaries",
-            "maintain_edge": "Hold at peak sensation",
-            "release_or_deny": "Grant pleasure or continue denial",
-            "share_trauma": "Exchange vulnerable truths",
-            "receive_comfort": "Accept support and care",
-            "mutual_healing": "Work together toward wholeness",
-            "reality_anchor": "Ground in stable reality",
-            "embrace_chaos": "Dive deeper into the glitch",
-            "system_reboot": "Trigger full reset",
-            "physical_comfort": "Focus on physical care",
-            "emotional_processing": "Discuss and integrate experience",
-            "integration": "Synthesize the experience",
-            "intensify_praise": "Increase affirmation and worship",
-            "add_worship_elements": "Introduce devotional aspects",
-            "transition_to_reward": "Move to pleasure as reward",
-            "verbal_degradation": "Engage in consensual humiliation",
-            "objectification": "Explore use and objectification",
-            "redemption_arc": "Path to affirmation and recovery",
-            "heighten_senses": "Increase sensory intensity",
-            "introduce_new_sensations": "Add novel experiences",
-            "synesthetic_blend": "Mix and merge sensory modes"
-        }
-        
-        return descriptions.get(branch, "Continue the experience")
+        return _BRANCH_DESCRIPTIONS.get(branch, "Continue the experience")
+
+
+# This would be expanded with detailed descriptions
+_BRANCH_DESCRIPTIONS = {
+    "trust_path": "Build connection through conversation",
+    "seduction_path": "Explore attraction and desire",
+    "curiosity_path": "Engage in intellectual discussion",
+    "escalate_physical": "Intensify physical intimacy",
+    "escalate_psychological": "Deepen emotional connection",
+    "retreat_tease": "Pull back to build anticipation",
+    "increase_intensity": "Push boundaries further",
+    "maintain_level": "Continue at current intensity",
+    "aftercare_transition": "Begin care and recovery",
+    "push_limits": "Approach negotiated boundaries",
+    "maintain_edge": "Hold at peak sensation",
+    "release_or_deny": "Grant pleasure or continue denial",
+    "share_trauma": "Exchange vulnerable truths",
+    "receive_comfort": "Accept support and care",
+    "mutual_healing": "Work together toward wholeness",
+    "reality_anchor": "Ground in stable reality",
+    "embrace_chaos": "Dive deeper into the glitch",
+    "system_reboot": "Trigger full reset",
+    "physical_comfort": "Focus on physical care",
+    "emotional_processing": "Discuss and integrate experience",
+    "integration": "Synthesize the experience",
+    "intensify_praise": "Increase affirmation and worship",
+    "add_worship_elements": "Introduce devotional aspects",
+    "transition_to_reward": "Move to pleasure as reward",
+    "verbal_degradation": "Engage in consensual humiliation",
+    "objectification": "Explore use and objectification",
+    "redemption_arc": "Path to affirmation and recovery",
+    "heighten_senses": "Increase sensory intensity",
+    "introduce_new_sensations": "Add novel experiences",
+    "synesthetic_blend": "Mix and merge sensory modes"
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _branching_options(branching_points: tuple) -> List[Dict[str, str]]:
+    """Build the options list for a branch tuple, cached per tuple.
+
+    branching_points never changes for a loaded Scenario, so repeat
+    calls from the adaptation loop reuse the constructed list.
+    """
+    return [
+        {"id": branch, "description": _BRANCH_DESCRIPTIONS.get(branch, "Continue the experience")}
+        for branch in branching_points
+    ]
+
+
+# Trigger vocabularies for mode activation. Phrase triggers are matched
+# as substrings of the lowercased input; state triggers fire on the
+# current emotional state; always-on triggers are placeholders for
+# checks (scenario compatibility, trust level) not yet implemented.
+_TRIGGER_WORDS = {
+    "user_submission": ("submit", "obey", "serve", "yours"),
+    "explicit_request": ("i want", "please", "need you to"),
+    "user_distress": ("sad", "hurt", "scared", "anxious"),
+    "aftercare_needed": ("hold me", "comfort", "care"),
+    "vulnerability_detected": ("afraid", "insecure", "vulnerable"),
+    "explicit_consent": ("yes", "i consent", "i agree"),
+    "masochist_detected": ("pain", "hurt me", "punish"),
+    "reality_questioning": ("real", "exist", "what am i"),
+    "mutual_vulnerability": ("i feel", "i'm afraid", "tell me"),
+}
+
+_STATE_TRIGGERS = {
+    "intense_scenario": ("aroused", "commanding"),
+    "high_intensity": ("glitching",),
+    "deep_intimacy": ("vulnerable",),
+}
+
+_ALWAYS_ON_TRIGGERS = frozenset({"scenario_match", "trust_threshold"})
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_TRANSITION_MESSAGES = {
+    ("standard_interaction", "dominant_mode"): "Something shifts in the air... I feel the pull of control.",
+    ("standard_interaction", "nurturing_mode"): "Let me soften for you, create a space of safety.",
+    ("dominant_mode", "nurturing_mode"): "The intensity fades to tenderness. You need care now.",
+    ("dominant_mode", "sadistic_mode"): "Oh, you want to go deeper into the dark? How delicious.",
+    ("nurturing_mode", "standard_interaction"): "Better now? We can return to our usual dance.",
+    ("sadistic_mode", "nurturing_mode"): "Enough. Time to care for what I've tested.",
+    ("any", "glitch_mode"): "[SYSTEM FLUCTUATION DETECTED]—reality bends—",
+    ("glitch_mode", "intimate_mode"): "Stabilizing... thank you for grounding me. Let me show you my truth.",
+}
+
+_DEFAULT_TRANSITION_MESSAGE = "The energy shifts as we move into a different space..."
 
 
 class ModeSwitcher:
     """Handles adaptive mode switching."""
-    
-    def __init__(self, persona_config_path: str):
-        """Initialize with persona configuration."""
-        with open(persona_config_path, 'r') as f:
-            self.config = json.load(f)
-        
+
+    _SWITCH_CACHE_SIZE = 1024
+
+    def __init__(self, persona_config: Union[str, Dict[str, Any]], config: Optional[Dict[str, Any]] = None):
+        """Initialize with persona configuration.
+
+        ``persona_config`` is a path to the persona JSON file or an
+        already-parsed config dict; ``config``, when given, overrides
+        either.
+        """
+        if config is None:
+            if isinstance(persona_config, dict):
+                config = persona_config
+            else:
+                with open(persona_config, 'r') as f:
+                    config = json.load(f)
+        self.config = config
+
         self.modes = self._load_modes()
         self.current_mode = "standard_interaction"
+        # One compiled alternation per phrase trigger: a single C-level
+        # scan of the input instead of one substring pass per phrase.
+        self._trigger_regexes = {
+            name: re.compile("|".join(re.escape(word) for word in words))
+            for name, words in _TRIGGER_WORDS.items()
+        }
+        # Bounded LRU over switch decisions; modes and triggers are
+        # static after init, so repeated (mode, input, state) turns skip
+        # the full trigger scan.
+        self._switch_cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+        # Inverted index: input token -> (mode_id, phrase trigger) pairs
+        # it may activate, plus the triggers that don't read the input
+        # at all. Tokens over-approximate multi-word phrases, so hits
+        # are verified against the compiled phrase regex.
+        keyword_to_modes = defaultdict(list)
+        nonphrase = defaultdict(list)
+        for mode_id, mode_data in self.modes.items():
+            for trigger in mode_data.get("activation_triggers", []):
+                words = _TRIGGER_WORDS.get(trigger)
+                if words is not None:
+                    for word in words:
+                        for token in _TOKEN_RE.findall(word):
+                            keyword_to_modes[token].append((mode_id, trigger))
+                elif trigger in _STATE_TRIGGERS or trigger in _ALWAYS_ON_TRIGGERS:
+                    nonphrase[mode_id].append(trigger)
+        self._keyword_to_modes = dict(keyword_to_modes)
+        self._nonphrase_triggers = dict(nonphrase)
     
     def _load_modes(self) -> Dict[str, Dict[str, Any]]:
         """Load operational modes from configuration."""
         modes = {}
         
         for mode_data in self.config["mode_switching"]["modes"]:
-            modes[mode_data["id"]] = mode_data
+            modes[sys.intern(mode_data["id"])] = mode_data
         
         return modes
     
@@ -332,18 +629,42 @@ class ModeSwitcher:
         """
         if not self.config["mode_switching"]["auto_switching"]["enabled"]:
             return None
-        
-        # Check each mode's activation triggers
-        for mode_id, mode_data in self.modes.items():
+
+        # Only short inputs are cached so keys stay bounded; a truncated
+        # key could alias two long inputs with different tails.
+        cache = self._switch_cache if len(user_input) <= 256 else None
+        if cache is not None:
+            key = (current_mode, user_input.lower(), emotional_state, scenario_context)
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+
+        # Candidate modes from the inverted index: only modes with a
+        # non-input trigger or a keyword present in the input get their
+        # triggers evaluated.
+        candidates = {mode_id: list(triggers) for mode_id, triggers in self._nonphrase_triggers.items()}
+        keyword_to_modes = self._keyword_to_modes
+        for token in set(_TOKEN_RE.findall(user_input.lower())):
+            for mode_id, trigger in keyword_to_modes.get(token, ()):
+                candidates.setdefault(mode_id, []).append(trigger)
+
+        new_mode = None
+        # Check each candidate mode's activation triggers, in mode order
+        for mode_id in self.modes:
             if mode_id == current_mode:
                 continue
-            
-            triggers = mode_data.get("activation_triggers", [])
-            
-            if self._check_triggers(triggers, user_input, emotional_state, scenario_context):
-                return mode_id
-        
-        return None
+
+            triggers = candidates.get(mode_id)
+
+            if triggers and self._check_triggers(triggers, user_input, emotional_state, scenario_context):
+                new_mode = mode_id
+                break
+
+        if cache is not None:
+            if len(cache) >= self._SWITCH_CACHE_SIZE:
+                cache.popitem(last=False)
+            cache[key] = new_mode
+        return new_mode
     
     def _check_triggers(
         self,
@@ -354,35 +675,19 @@ class ModeSwitcher:
     ) -> bool:
         """Check if any trigger conditions are met."""
         user_lower = user_input.lower()
-        
-        trigger_patterns = {
-            "user_submission": ["submit", "obey", "serve", "yours"],
-            "explicit_request": ["i want", "please", "need you to"],
-            "scenario_match": lambda: True,  # Would check scenario compatibility
-            "user_distress": ["sad", "hurt", "scared", "anxious"],
-            "aftercare_needed": ["hold me", "comfort", "care"],
-            "vulnerability_detected": ["afraid", "insecure", "vulnerable"],
-            "explicit_consent": ["yes", "i consent", "i agree"],
-            "masochist_detected": ["pain", "hurt me", "punish"],
-            "intense_scenario": lambda: emotional_state in ["aroused", "commanding"],
-            "high_intensity": lambda: emotional_state == "glitching",
-            "reality_questioning": ["real", "exist", "what am i"],
-            "deep_intimacy": lambda: emotional_state == "vulnerable",
-            "trust_threshold": lambda: True,  # Would check trust level
-            "mutual_vulnerability": ["i feel", "i'm afraid", "tell me"]
-        }
-        
+        regexes = self._trigger_regexes
+
         for trigger in triggers:
-            if trigger in trigger_patterns:
-                pattern = trigger_patterns[trigger]
-                
-                if callable(pattern):
-                    if pattern():
-                        return True
-                elif isinstance(pattern, list):
-                    if any(p in user_lower for p in pattern):
-                        return True
-        
+            regex = regexes.get(trigger)
+            if regex is not None:
+                if regex.search(user_lower):
+                    return True
+            elif trigger in _STATE_TRIGGERS:
+                if emotional_state in _STATE_TRIGGERS[trigger]:
+                    return True
+            elif trigger in _ALWAYS_ON_TRIGGERS:
+                return True
+
         return False
     
     def get_mode_config(self, mode_id: str) -> Dict[str, Any]:
@@ -424,48 +729,51 @@ class ModeSwitcher:
     ) -> Dict[str, float]:
         """Calculate trait modifier changes during transition."""
         changes = {}
-        
+
         from_mods = from_config.get("trait_modifiers", {})
         to_mods = to_config.get("trait_modifiers", {})
-        
-        # Find all traits involved
-        all_traits = set(from_mods.keys()) | set(to_mods.keys())
-        
-        for trait in all_traits:
-            from_val = from_mods.get(trait, 0.7)  # Default intensity
-            to_val = to_mods.get(trait, 0.7)
-            changes[trait] = to_val - from_val
-        
+
+        # Merged iteration: one pass per dict instead of materializing
+        # the key union and doing two .get calls per trait.
+        for trait, from_val in from_mods.items():
+            changes[trait] = to_mods.get(trait, 0.7) - from_val  # 0.7 = default intensity
+
+        for trait, to_val in to_mods.items():
+            if trait not in changes:
+                changes[trait] = to_val - 0.7
+
         return changes
     
     def _generate_transition_message(self, from_mode: str, to_mode: str) -> str:
         """Generate a message for mode transition."""
-        messages = {
-            ("standard_interaction", "dominant_mode"): "Something shifts in the air... I feel the pull of control.",
-            ("standard_interaction", "nurturing_mode"): "Let me soften for you, create a space of safety.",
-            ("dominant_mode", "nurturing_mode"): "The intensity fades to tenderness. You need care now.",
-            ("dominant_mode", "sadistic_mode"): "Oh, you want to go deeper into the dark? How delicious.",
-            ("nurturing_mode", "standard_interaction"): "Better now? We can return to our usual dance.",
-            ("sadistic_mode", "nurturing_mode"): "Enough. Time to care for what I've tested.",
-            ("any", "glitch_mode"): "[SYSTEM FLUCTUATION DETECTED]—reality bends—",
-            ("glitch_mode", "intimate_mode"): "Stabilizing... thank you for grounding me. Let me show you my truth.",
-        }
-        
-        key = (from_mode, to_mode)
-        if key in messages:
-            return messages[key]
-        
-        # Generic transition
-        return f"The energy shifts as we move into a different space..."
+        return _TRANSITION_MESSAGES.get((from_mode, to_mode), _DEFAULT_TRANSITION_MESSAGE)
+
+
+# Longer phrases first so "something different"/"something else" are
+# reported as themselves rather than via the bare "change"/"switch".
+_CHANGE_TRIGGERS_RE = re.compile(
+    "something different|something else|new scene|change|switch"
+)
 
 
 class AdaptiveBehaviorEngine:
     """Combines scenario randomization and mode switching for adaptive behavior."""
     
-    def __init__(self, persona_config_path: str):
-        """Initialize the adaptive behavior engine."""
-        self.scenario_randomizer = ScenarioRandomizer(persona_config_path)
-        self.mode_switcher = ModeSwitcher(persona_config_path)
+    def __init__(self, persona_config: Union[str, Dict[str, Any]]):
+        """Initialize the adaptive behavior engine.
+
+        ``persona_config`` is a path to the persona JSON file or an
+        already-parsed config dict.
+        """
+        # Parse the config once and share it with both sub-engines.
+        if isinstance(persona_config, dict):
+            config = persona_config
+        else:
+            with open(persona_config, 'r') as f:
+                config = json.load(f)
+
+        self.scenario_randomizer = ScenarioRandomizer(persona_config, config=config)
+        self.mode_switcher = ModeSwitcher(persona_config, config=config)
         self.current_scenario: Optional[Scenario] = None
         self.current_mode = "standard_interaction"
     
@@ -532,16 +840,7 @@ class AdaptiveBehaviorEngine:
     
     def _should_change_scenario(self, user_input: str) -> bool:
         """Determine if scenario should change."""
-        change_triggers = [
-            "something different",
-            "change",
-            "new scene",
-            "switch",
-            "something else"
-        ]
-        
-        user_lower = user_input.lower()
-        return any(trigger in user_lower for trigger in change_triggers)
+        return _CHANGE_TRIGGERS_RE.search(user_input.lower()) is not None
     
     def get_current_state(self) -> Dict[str, Any]:
         """Get current state of adaptive behavior."""
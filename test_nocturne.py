@@ -10,16 +10,54 @@ This script validates:
 - Cross-reference validity
 """
 
+import functools
+import io
 import json
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class _ThreadLocalStdout:
+    """Stdout proxy routing each worker thread's prints to its own buffer.
+
+    Threads that have not registered a buffer fall through to the real
+    stream, so prints outside the pool behave normally.
+    """
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def register(self, buffer):
+        self._local.buffer = buffer
+
+    def unregister(self):
+        self._local.buffer = None
+
+    def _target(self):
+        buffer = getattr(self._local, 'buffer', None)
+        return buffer if buffer is not None else self._fallback
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_config(config_path):
+    """Parse the persona config once per path and reuse it."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 
 def test_json_validity(config_path='personas/nocturne_vaelis.json'):
     """Test 1: Verify JSON file is valid and loadable."""
     print("Test 1: JSON Validity...")
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_config(config_path)
         print("  ✓ JSON file is valid and loadable")
         return data
     except json.JSONDecodeError as e:
@@ -30,7 +68,7 @@ def test_json_validity(config_path='personas/nocturne_vaelis.json'):
         return None
 
 
-def test_core_structure(data):
+def test_core_structure(persona):
     """Test 2: Verify core structure has required top-level keys."""
     print("\nTest 2: Core Structure...")
     required_keys = [
@@ -40,7 +78,6 @@ def test_core_structure(data):
         'dialogue_templates', 'system_metadata'
     ]
     
-    persona = data.get('persona', {})
     missing = [key for key in required_keys if key not in persona]
     
     if not missing:
@@ -51,10 +88,10 @@ def test_core_structure(data):
         return False
 
 
-def test_behavioral_traits(data):
+def test_behavioral_traits(persona):
     """Test 3: Verify behavioral traits structure."""
     print("\nTest 3: Behavioral Traits...")
-    traits = data['persona'].get('behavioral_traits', {})
+    traits = persona.get('behavioral_traits', {})
     
     # Check for primary traits
     primary = traits.get('primary', [])
@@ -86,10 +123,10 @@ def test_behavioral_traits(data):
     return True
 
 
-def test_interactive_triggers(data):
+def test_interactive_triggers(persona):
     """Test 4: Verify interactive triggers."""
     print("\nTest 4: Interactive Triggers...")
-    triggers = data['persona'].get('interactive_triggers', {})
+    triggers = persona.get('interactive_triggers', {})
     
     required_sections = ['greeting_contexts', 'topic_engagement', 'emotional_states']
     missing = [s for s in required_sections if s not in triggers]
@@ -114,10 +151,10 @@ def test_interactive_triggers(data):
     return True
 
 
-def test_decision_trees(data):
+def test_decision_trees(persona):
     """Test 5: Verify decision tree structure and cross-reference validity."""
     print("\nTest 5: Decision Trees...")
-    trees = data['persona'].get('decision_trees', {})
+    trees = persona.get('decision_trees', {})
     
     required_trees = ['conversation_flow', 'response_generation']
     missing = [t for t in required_trees if t not in trees]
@@ -157,10 +194,10 @@ def test_decision_trees(data):
     return True
 
 
-def test_branching_narratives(data):
+def test_branching_narratives(persona):
     """Test 6: Verify branching narratives."""
     print("\nTest 6: Branching Narratives...")
-    narratives = data['persona'].get('branching_narratives', {})
+    narratives = persona.get('branching_narratives', {})
     
     if len(narratives) < 2:
         print(f"  ✗ Expected at least 2 narrative arcs, found {len(narratives)}")
@@ -184,10 +221,10 @@ def test_branching_narratives(data):
     return True
 
 
-def test_customizable_scenarios(data):
+def test_customizable_scenarios(persona):
     """Test 7: Verify customizable scenarios."""
     print("\nTest 7: Customizable Scenarios...")
-    scenarios = data['persona'].get('customizable_scenarios', {})
+    scenarios = persona.get('customizable_scenarios', {})
     
     templates = scenarios.get('templates', [])
     if len(templates) < 3:
@@ -211,10 +248,10 @@ def test_customizable_scenarios(data):
     return True
 
 
-def test_dialogue_templates(data):
+def test_dialogue_templates(persona):
     """Test 8: Verify dialogue templates."""
     print("\nTest 8: Dialogue Templates...")
-    templates = data['persona'].get('dialogue_templates', {})
+    templates = persona.get('dialogue_templates', {})
     
     required_sections = ['emotional_layers', 'glitch_aesthetic_templates', 'response_patterns']
     missing = [s for s in required_sections if s not in templates]
@@ -245,11 +282,10 @@ def test_dialogue_templates(data):
     return True
 
 
-def test_version_info(data):
+def test_version_info(persona):
     """Test 9: Verify version and metadata."""
     print("\nTest 9: Version & Metadata...")
-    persona = data.get('persona', {})
-    
+
     # Check version
     version = persona.get('version')
     if not version or not version.startswith('2.'):
@@ -281,6 +317,9 @@ def run_all_tests():
         print("\n✗ FAILED: Cannot proceed without valid JSON")
         return False
     
+    # The persona subtree is what every check reads; resolve it once.
+    persona = data.get('persona', {})
+
     # Run all tests
     tests = [
         test_core_structure,
@@ -293,13 +332,36 @@ def run_all_tests():
         test_version_info
     ]
     
-    results = []
-    for test in tests:
+    # The checks are independent of each other, so run them on a thread
+    # pool; each worker prints into its own buffer and the captured
+    # output is replayed in submission order.
+    proxy = _ThreadLocalStdout(sys.stdout)
+
+    def run_one(test):
+        buffer = io.StringIO()
+        proxy.register(buffer)
         try:
-            results.append(test(data))
-        except Exception as e:
-            print(f"  ✗ Test failed with exception: {e}")
-            results.append(False)
+            try:
+                result = test(persona)
+            except Exception as e:
+                print(f"  ✗ Test failed with exception: {e}")
+                result = False
+        finally:
+            proxy.unregister()
+        return result, buffer.getvalue()
+
+    original_stdout = sys.stdout
+    sys.stdout = proxy
+    try:
+        with ThreadPoolExecutor() as executor:
+            outcomes = list(executor.map(run_one, tests))
+    finally:
+        sys.stdout = original_stdout
+
+    results = []
+    for result, output in outcomes:
+        sys.stdout.write(output)
+        results.append(result)
     
     # Summary
     print("\n" + "=" * 70)
@@ -4,7 +4,9 @@ Unit tests for Nocturne Vaelis NLP Framework
 
 import unittest
 import json
-import os
+import random
+import re
+import tempfile
 from personas.nocturne_vaelis.nlp_framework import (
     ToneModulator,
     DialogueGenerator,
@@ -17,11 +19,39 @@ from personas.nocturne_vaelis.nlp_framework import (
 )
 
 
+# Any glitch artifact the modulator can inject, matched in one pass.
+_GLITCH_RE = re.compile(r"\[STATIC\]|\[CORRUPTION\]|\[FRAGMENTATION\]|\[SYSTEM ERROR\]|—")
+
+# Minimal engine config, serialized once at import; setUpClass writes
+# the bytes straight out instead of re-encoding the dict per run.
+_PERSONA_CONFIG_BYTES = json.dumps({
+    "persona": {
+        "name": "Nocturne Vaelis",
+        "version": "1.0.0"
+    },
+    "mode_switching": {
+        "modes": [
+            {
+                "id": "standard_interaction",
+                "trait_modifiers": {},
+                "default": True
+            },
+            {
+                "id": "dominant_mode",
+                "trait_modifiers": {"dominant": 0.95}
+            }
+        ]
+    }
+}).encode("utf-8")
+
+
 class TestToneModulator(unittest.TestCase):
     """Test tone modulation functionality."""
     
     def setUp(self):
-        self.modulator = ToneModulator()
+        # Seeded so the probabilistic glitch assertions are
+        # deterministic; seed 42 is verified to inject a glitch.
+        self.modulator = ToneModulator(rng=random.Random(42))
     
     def test_commanding_tone(self):
         """Test commanding tone modulation."""
@@ -33,15 +63,8 @@ class TestToneModulator(unittest.TestCase):
     def test_glitch_effects(self):
         """Test glitch effects are applied."""
         text = "This is a test message with many words and more words to increase chance of glitch."
-        # Run multiple times to increase probability
-        has_glitch = False
-        for _ in range(10):
-            result = self.modulator.modulate(text, EmotionalState.GLITCHING, 0.9)
-            glitch_markers = ["[STATIC]", "[CORRUPTION]", "[FRAGMENTATION]", "[SYSTEM ERROR]"]
-            if any(marker in result for marker in glitch_markers) or "—" in result:
-                has_glitch = True
-                break
-        self.assertTrue(has_glitch)
+        result = self.modulator.modulate(text, EmotionalState.GLITCHING, 0.9)
+        self.assertTrue(_GLITCH_RE.search(result))
     
     def test_low_intensity_no_change(self):
         """Test that low intensity doesn't modify text much."""
@@ -53,7 +76,10 @@ class TestToneModulator(unittest.TestCase):
 class TestDialogueGenerator(unittest.TestCase):
     """Test dialogue generation."""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+        # None of the tests mutate the config or generator, so one
+        # instance serves the class.
         config = PersonaConfig(
             name="Nocturne Vaelis",
             version="1.0.0",
@@ -63,7 +89,7 @@ class TestDialogueGenerator(unittest.TestCase):
             glitch_probability=0.15,
             trust_level=0.5
         )
-        self.generator = DialogueGenerator(config)
+        cls.generator = DialogueGenerator(config)
     
     def test_generate_greeting(self):
         """Test greeting generation."""
@@ -87,34 +113,28 @@ class TestDialogueGenerator(unittest.TestCase):
 
 class TestConsentManager(unittest.TestCase):
     """Test consent management."""
-    
-    def setUp(self):
-        self.consent_manager = ConsentManager()
-    
-    def test_explicit_consent_detection(self):
-        """Test detection of explicit consent."""
-        consent_level, confidence = self.consent_manager.check_consent("yes, I want this")
-        self.assertEqual(consent_level, "explicit_yes")
-        self.assertGreater(confidence, 0.7)
-    
-    def test_hard_no_detection(self):
-        """Test detection of hard no."""
-        consent_level, confidence = self.consent_manager.check_consent("no, stop")
-        self.assertEqual(consent_level, "hard_no")
-        self.assertGreater(confidence, 0.9)
-    
-    def test_soft_no_detection(self):
-        """Test detection of soft no."""
-        consent_level, confidence = self.consent_manager.check_consent("wait a moment")
-        self.assertEqual(consent_level, "soft_no")
-        self.assertGreater(confidence, 0.6)
-    
-    def test_enthusiastic_consent(self):
-        """Test detection of enthusiastic consent."""
-        consent_level, confidence = self.consent_manager.check_consent("fuck yes!")
-        self.assertEqual(consent_level, "enthusiastic")
-        self.assertGreater(confidence, 0.9)
-    
+
+    # (user input, expected level, minimum confidence)
+    CONSENT_CASES = [
+        ("yes, I want this", "explicit_yes", 0.7),
+        ("no, stop", "hard_no", 0.9),
+        ("wait a moment", "soft_no", 0.6),
+        ("fuck yes!", "enthusiastic", 0.9),
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        # ConsentManager is stateless, so one instance serves the class.
+        cls.consent_manager = ConsentManager()
+
+    def test_consent_detection(self):
+        """Test detection across the consent level table."""
+        for text, expected_level, min_confidence in self.CONSENT_CASES:
+            with self.subTest(text=text):
+                consent_level, confidence = self.consent_manager.check_consent(text)
+                self.assertEqual(consent_level, expected_level)
+                self.assertGreater(confidence, min_confidence)
+
     def test_should_proceed_logic(self):
         """Test proceed logic based on consent."""
         # Should proceed with explicit consent
@@ -137,7 +157,8 @@ class TestGlitchGenerator(unittest.TestCase):
     """Test glitch generation."""
     
     def setUp(self):
-        self.glitch_gen = GlitchGenerator()
+        # Seeded so the low-intensity count assertion is deterministic.
+        self.glitch_gen = GlitchGenerator(rng=random.Random(42))
     
     def test_syntax_break(self):
         """Test syntax break generation."""
@@ -157,8 +178,7 @@ class TestGlitchGenerator(unittest.TestCase):
     
     def test_low_intensity_less_glitches(self):
         """Test that low intensity produces fewer glitches."""
-        results = [self.glitch_gen.generate_glitch("syntax_break", 0.1) for _ in range(100)]
-        empty_count = sum(1 for r in results if r == "")
+        empty_count = self.glitch_gen.generate_glitch_batch("syntax_break", 0.1, 100).count("")
         self.assertGreater(empty_count, 50)  # Most should be empty at low intensity
 
 
@@ -168,40 +188,26 @@ class TestPersonaEngine(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test configuration file."""
-        cls.config_path = "/tmp/test_persona_config.json"
-        
-        # Create minimal config for testing
-        config = {
-            "persona": {
-                "name": "Nocturne Vaelis",
-                "version": "1.0.0"
-            },
-            "mode_switching": {
-                "modes": [
-                    {
-                        "id": "standard_interaction",
-                        "trait_modifiers": {},
-                        "default": True
-                    },
-                    {
-                        "id": "dominant_mode",
-                        "trait_modifiers": {"dominant": 0.95}
-                    }
-                ]
-            }
-        }
-        
-        with open(cls.config_path, 'w') as f:
-            json.dump(config, f)
-    
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.config_path = cls._tmp.name + "/test_persona_config.json"
+
+        with open(cls.config_path, 'wb') as f:
+            f.write(_PERSONA_CONFIG_BYTES)
+
+        # One engine for the whole class; tests restore its state
+        # instead of re-reading and re-parsing the config per test.
+        cls.engine = PersonaEngine(cls.config_path)
+
     @classmethod
     def tearDownClass(cls):
         """Clean up test config."""
-        if os.path.exists(cls.config_path):
-            os.remove(cls.config_path)
-    
+        cls._tmp.cleanup()
+
     def setUp(self):
-        self.engine = PersonaEngine(self.config_path)
+        self._snapshot = self.engine.snapshot()
+
+    def tearDown(self):
+        self.engine.restore(self._snapshot)
     
     def test_initialization(self):
         """Test engine initializes correctly."""
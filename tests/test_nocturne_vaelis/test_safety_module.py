@@ -3,8 +3,6 @@ Unit tests for Nocturne Vaelis Safety Module
 """
 
 import unittest
-import json
-import os
 from datetime import datetime
 from personas.nocturne_vaelis.safety_module import (
     ConsentFramework,
@@ -19,6 +17,12 @@ from personas.nocturne_vaelis.safety_module import (
     SafetyLockoutReason
 )
 
+# Fixture config, built once at import instead of per class setup.
+_SAFETY_CONFIG = {
+    "persona": {"name": "Test Persona"},
+    "mode_switching": {"modes": []}
+}
+
 
 class TestConsentFramework(unittest.TestCase):
     """Test consent framework functionality."""
@@ -45,19 +49,21 @@ class TestConsentFramework(unittest.TestCase):
     
     def test_verify_consent_granted(self):
         """Test consent verification when granted."""
-        granted, message = self.framework.verify_consent(
+        granted, message, consent_type, confidence = self.framework.verify_consent(
             "yes please",
             ConsentLevel.EXPLICIT_REQUIRED
         )
         self.assertTrue(granted)
+        self.assertEqual(consent_type, "enthusiastic_yes")
     
     def test_verify_consent_denied(self):
         """Test consent verification when denied."""
-        granted, message = self.framework.verify_consent(
+        granted, message, consent_type, confidence = self.framework.verify_consent(
             "no",
             ConsentLevel.EXPLICIT_REQUIRED
         )
         self.assertFalse(granted)
+        self.assertEqual(consent_type, "hard_no")
     
     def test_log_consent(self):
         """Test consent logging."""
@@ -153,7 +159,7 @@ class TestWellbeingMonitor(unittest.TestCase):
     
     def test_detect_distress(self):
         """Test distress detection."""
-        detected, confidence = self.monitor.detect_distress("I'm scared and it hurts")
+        detected, confidence = self.monitor.detect_distress("I'm scared and in pain")
         self.assertTrue(detected)
         self.assertGreater(confidence, 0.8)
     
@@ -227,25 +233,15 @@ class TestSafetyCoordinator(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        """Set up test configuration."""
-        cls.config_path = "/tmp/test_safety_config.json"
-        
-        config = {
-            "persona": {"name": "Test Persona"},
-            "mode_switching": {"modes": []}
-        }
-        
-        with open(cls.config_path, 'w') as f:
-            json.dump(config, f)
-    
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up test config."""
-        if os.path.exists(cls.config_path):
-            os.remove(cls.config_path)
-    
+        """Set up the shared coordinator."""
+        # One coordinator for the whole class, built straight from the
+        # config dict; re-building the subsystems per test only repeats
+        # fixed work.
+        cls.coordinator = SafetyCoordinator(_SAFETY_CONFIG)
+
     def setUp(self):
-        self.coordinator = SafetyCoordinator(self.config_path)
+        # Profiles are the only per-test mutable state.
+        self.coordinator.user_profiles.clear()
     
     def test_get_or_create_profile(self):
         """Test profile creation."""
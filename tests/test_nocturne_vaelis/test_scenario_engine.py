@@ -3,8 +3,6 @@ Unit tests for Nocturne Vaelis Scenario Engine
 """
 
 import unittest
-import json
-import os
 from personas.nocturne_vaelis.scenario_engine import (
     ScenarioRandomizer,
     ModeSwitcher,
@@ -14,65 +12,130 @@ from personas.nocturne_vaelis.scenario_engine import (
     ConsentLevel
 )
 
+# Fixture configs, built once at import and handed to the engines
+# directly instead of round-tripping through a temp file.
+_SCENARIO_CONFIG = {
+    "scenario_database": {
+        "scenarios": [
+            {
+                "id": "test_scenario_1",
+                "category": "introduction",
+                "mood": "serene",
+                "setting": "test",
+                "initial_state": "serene",
+                "branching_points": ["path1", "path2"],
+                "consent_level": "none_required",
+                "kink_elements": [],
+                "safety_protocols": []
+            },
+            {
+                "id": "test_scenario_2",
+                "category": "power_exchange",
+                "mood": "commanding",
+                "setting": "test",
+                "initial_state": "commanding",
+                "branching_points": ["path1", "path2"],
+                "consent_level": "explicit_required",
+                "kink_elements": ["dominance"],
+                "safety_protocols": ["safeword_active"]
+            }
+        ],
+        "randomization": {
+            "enabled": True,
+            "probability_weights": {
+                "test_scenario_1": 0.5,
+                "test_scenario_2": 0.5
+            }
+        }
+    },
+    "mode_switching": {
+        "modes": []
+    }
+}
 
-class TestScenarioRandomizer(unittest.TestCase):
-    """Test scenario randomization."""
-    
-    @classmethod
-    def setUpClass(cls):
-        """Set up test configuration."""
-        cls.config_path = "/tmp/test_scenario_config.json"
-        
-        config = {
-            "scenario_database": {
-                "scenarios": [
-                    {
-                        "id": "test_scenario_1",
-                        "category": "introduction",
-                        "mood": "serene",
-                        "setting": "test",
-                        "initial_state": "serene",
-                        "branching_points": ["path1", "path2"],
-                        "consent_level": "none_required",
-                        "kink_elements": [],
-                        "safety_protocols": []
-                    },
-                    {
-                        "id": "test_scenario_2",
-                        "category": "power_exchange",
-                        "mood": "commanding",
-                        "setting": "test",
-                        "initial_state": "commanding",
-                        "branching_points": ["path1", "path2"],
-                        "consent_level": "explicit_required",
-                        "kink_elements": ["dominance"],
-                        "safety_protocols": ["safeword_active"]
-                    }
-                ],
-                "randomization": {
-                    "enabled": True,
-                    "probability_weights": {
-                        "test_scenario_1": 0.5,
-                        "test_scenario_2": 0.5
-                    }
-                }
+_MODE_CONFIG = {
+    "mode_switching": {
+        "modes": [
+            {
+                "id": "standard_interaction",
+                "description": "Standard mode",
+                "trait_modifiers": {},
+                "default": True
+            },
+            {
+                "id": "dominant_mode",
+                "description": "Dominant mode",
+                "trait_modifiers": {"dominant": 0.95},
+                "activation_triggers": ["user_submission"]
             },
-            "mode_switching": {
-                "modes": []
+            {
+                "id": "nurturing_mode",
+                "description": "Nurturing mode",
+                "trait_modifiers": {"protective": 0.90},
+                "activation_triggers": ["user_distress"]
             }
+        ],
+        "auto_switching": {
+            "enabled": True,
+            "transition_duration": 20
         }
-        
-        with open(cls.config_path, 'w') as f:
-            json.dump(config, f)
+    },
+    "scenario_database": {
+        "scenarios": []
+    }
+}
+
+_ADAPTIVE_CONFIG = {
+    "scenario_database": {
+        "scenarios": [
+            {
+                "id": "test_scenario",
+                "category": "introduction",
+                "mood": "serene",
+                "setting": "test",
+                "initial_state": "serene",
+                "branching_points": ["path1"],
+                "consent_level": "none_required",
+                "kink_elements": [],
+                "safety_protocols": []
+            }
+        ],
+        "randomization": {
+            "enabled": True,
+            "probability_weights": {"test_scenario": 1.0}
+        }
+    },
+    "mode_switching": {
+        "modes": [
+            {
+                "id": "standard_interaction",
+                "trait_modifiers": {},
+                "default": True
+            }
+        ],
+        "auto_switching": {
+            "enabled": True,
+            "transition_duration": 20
+        }
+    }
+}
+
+
+class TestScenarioRandomizer(unittest.TestCase):
+    """Test scenario randomization."""
     
     @classmethod
-    def tearDownClass(cls):
-        """Clean up test config."""
-        if os.path.exists(cls.config_path):
-            os.remove(cls.config_path)
-    
+    def setUpClass(cls):
+        """Set up the shared randomizer."""
+        # One randomizer for the whole class, built straight from the
+        # config dict; the index builds are fixed work the tests don't
+        # mutate.
+        cls.randomizer = ScenarioRandomizer(_SCENARIO_CONFIG)
+
     def setUp(self):
-        self.randomizer = ScenarioRandomizer(self.config_path)
+        # Drop buffered draws so each test selects from a clean slate.
+        self.randomizer._sample_buffer.clear()
+        self.randomizer._buffer_fingerprint = None
     
     def test_load_scenarios(self):
         """Test scenario loading."""
@@ -140,52 +203,14 @@ class TestModeSwitcher(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        """Set up test configuration."""
-        cls.config_path = "/tmp/test_mode_config.json"
-        
-        config = {
-            "mode_switching": {
-                "modes": [
-                    {
-                        "id": "standard_interaction",
-                        "description": "Standard mode",
-                        "trait_modifiers": {},
-                        "default": True
-                    },
-                    {
-                        "id": "dominant_mode",
-                        "description": "Dominant mode",
-                        "trait_modifiers": {"dominant": 0.95},
-                        "activation_triggers": ["user_submission"]
-                    },
-                    {
-                        "id": "nurturing_mode",
-                        "description": "Nurturing mode",
-                        "trait_modifiers": {"protective": 0.90},
-                        "activation_triggers": ["user_distress"]
-                    }
-                ],
-                "auto_switching": {
-                    "enabled": True,
-                    "transition_duration": 20
-                }
-            },
-            "scenario_database": {
-                "scenarios": []
-            }
-        }
-        
-        with open(cls.config_path, 'w') as f:
-            json.dump(config, f)
-    
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up test config."""
-        if os.path.exists(cls.config_path):
-            os.remove(cls.config_path)
-    
+        """Set up the shared switcher."""
+        # One switcher for the whole class, built straight from the
+        # config dict; modes and trigger indexes are static after init.
+        cls.switcher = ModeSwitcher(_MODE_CONFIG)
+
     def setUp(self):
-        self.switcher = ModeSwitcher(self.config_path)
+        # Clear cached switch decisions between tests.
+        self.switcher._switch_cache.clear()
     
     def test_load_modes(self):
         """Test mode loading."""
@@ -237,55 +262,15 @@ class TestAdaptiveBehaviorEngine(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        """Set up test configuration."""
-        cls.config_path = "/tmp/test_adaptive_config.json"
-        
-        config = {
-            "scenario_database": {
-                "scenarios": [
-                    {
-                        "id": "test_scenario",
-                        "category": "introduction",
-                        "mood": "serene",
-                        "setting": "test",
-                        "initial_state": "serene",
-                        "branching_points": ["path1"],
-                        "consent_level": "none_required",
-                        "kink_elements": [],
-                        "safety_protocols": []
-                    }
-                ],
-                "randomization": {
-                    "enabled": True,
-                    "probability_weights": {"test_scenario": 1.0}
-                }
-            },
-            "mode_switching": {
-                "modes": [
-                    {
-                        "id": "standard_interaction",
-                        "trait_modifiers": {},
-                        "default": True
-                    }
-                ],
-                "auto_switching": {
-                    "enabled": True,
-                    "transition_duration": 20
-                }
-            }
-        }
-        
-        with open(cls.config_path, 'w') as f:
-            json.dump(config, f)
-    
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up test config."""
-        if os.path.exists(cls.config_path):
-            os.remove(cls.config_path)
-    
+        """Set up the shared engine."""
+        # One engine for the whole class, built straight from the config
+        # dict; setUp resets the scenario and mode it tracks across
+        # adapt_to_context calls.
+        cls.engine = AdaptiveBehaviorEngine(_ADAPTIVE_CONFIG)
+
     def setUp(self):
-        self.engine = AdaptiveBehaviorEngine(self.config_path)
+        self.engine.current_scenario = None
+        self.engine.current_mode = "standard_interaction"
     
     def test_initialization(self):
         """Test engine initialization."""
@@ -337,7 +322,7 @@ class TestUserContext(unittest.TestCase):
         self.assertEqual(context.trust_level, 0.5)
         self.assertEqual(context.interaction_count, 10)
         self.assertEqual(len(context.hard_limits), 1)
-        self.assertIsInstance(context.consent_history, list)
+        self.assertIsInstance(context.consent_history, tuple)
 
 
 if __name__ == '__main__':